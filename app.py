@@ -1,16 +1,62 @@
 """
 Backend Flask: upload PDF, ekstrak teks warna biru, generate PDF output.
 """
+import functools
 import os
 import re
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+import numpy as np
 from flask import Flask, request, send_file, render_template, jsonify
 import fitz  # PyMuPDF
 
+try:
+    import orjson  # opsional: encoder JSON berbasis C untuk respons besar
+except ImportError:  # pragma: no cover
+    orjson = None
+
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16 MB max upload
 
+
+@app.errorhandler(413)
+def _too_large(_e):
+    # Upload melebihi MAX_CONTENT_LENGTH ditolak di lapisan WSGI sebelum
+    # byte pertama diproses — balas dengan bentuk error JSON API ini.
+    return jsonify({"error": "File terlalu besar (maks 16MB)"}), 413
+
+
+def ojsonify(obj):
+    """jsonify cepat untuk payload besar: orjson bila tersedia, selain itu flask.jsonify."""
+    if orjson is None:
+        return jsonify(obj)
+    return app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+# Flags get_text("dict") tanpa TEXT_PRESERVE_IMAGES: MuPDF tidak perlu decode
+# XObject gambar sama sekali (blok type=1 tidak pernah dipakai di sini).
+TEXT_EXTRACT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Font base-14 untuk PDF keluaran — dibuat SEKALI; insert per baris tidak perlu
+# resolve nama "helv" berulang kali.
+FONT_HELV = fitz.Font("helv")
+
+
+def _pdf_save_opts(compress: bool) -> dict:
+    """Opsi doc.save/tobytes: terkompresi flate (default) atau mentah seperti dulu."""
+    if compress:
+        return {"garbage": 4, "deflate": True, "deflate_images": True, "deflate_fonts": True}
+    # Dokumen di sini selalu dibangun segar, tidak ada objek tak terpakai —
+    # jalur cepat tanpa kompresi boleh melewati pass garbage collection.
+    return {"garbage": 0, "deflate": False, "clean": False}
+
+
+def _to_latin1(s: str) -> str:
+    """Ganti karakter di luar Latin-1 dengan '?' agar aman untuk font helv.
+
+    Codec C-level jauh lebih cepat daripada menyaring ord() per karakter.
+    """
+    return s.encode("latin-1", "replace").decode("latin-1")
+
 # Warna biru: sRGB 0xRRGGBB atau tuple (r,g,b) 0–1. Kita anggap "biru" jika B dominan.
 def _color_to_rgb(color):
     """Ubah color (int/tuple) ke (r, g, b) 0–255, atau None jika invalid."""
@@ -28,168 +74,267 @@ def _color_to_rgb(color):
     return None
 
 
-def is_blue_color(color) -> bool:
-    """Cek apakah warna (sRGB int atau tuple float) dianggap biru."""
+# Hasil klasifikasi warna: biru, bukan-biru, atau tanpa metadata warna.
+_COLOR_BLUE = 0
+_COLOR_OTHER = 1
+_COLOR_NONE = 2
+
+
+@functools.lru_cache(maxsize=512)
+def _classify_color(color) -> int:
+    """Klasifikasi warna ke _COLOR_BLUE/_COLOR_OTHER/_COLOR_NONE (di-cache:
+    PDF mengulang segelintir nilai warna yang sama di puluhan ribu span)."""
+    # Fast path: PyMuPDF hampir selalu memberi warna sebagai packed int sRGB.
+    # Uji langsung dengan mask/shift tanpa membangun tuple (r, g, b).
+    if type(color) is int:
+        b = color & 0xFF
+        if b >= 80 and b > ((color >> 16) & 0xFF) and b > ((color >> 8) & 0xFF):
+            return _COLOR_BLUE
+        return _COLOR_OTHER
     rgb = _color_to_rgb(color)
     if rgb is None:
-        return False
+        return _COLOR_NONE
     r, g, b = rgb
-    return b > r and b > g and b >= 80
+    if b > r and b > g and b >= 80:
+        return _COLOR_BLUE
+    return _COLOR_OTHER
+
+
+def _color_key(color):
+    """Kunci hashable untuk cache klasifikasi (list/bbox dikonversi ke tuple)."""
+    if isinstance(color, list):
+        return tuple(color)
+    return color
+
+
+def is_blue_color(color) -> bool:
+    """Cek apakah warna (sRGB int atau tuple float) dianggap biru."""
+    try:
+        return _classify_color(_color_key(color)) == _COLOR_BLUE
+    except TypeError:  # warna tidak hashable (bentuk tak terduga)
+        return _classify_color.__wrapped__(color) == _COLOR_BLUE
 
 
 def is_explicitly_other_color(color) -> bool:
     """True jika warna bukan biru — jangan ikutkan sebagai lanjutan paragraf biru.
     Hitam/abu-abu/merah/hijau = hentikan paragraf biru. None = tidak ada metadata (tetap hentikan agar teks hitam tidak ikut).
     """
-    rgb = _color_to_rgb(color)
-    if rgb is None:
-        return True  # tidak ada warna = anggap bukan biru, jangan ikutkan (hindari teks hitam ikut)
-    r, g, b = rgb
-    if b > r and b > g and b >= 80:
-        return False  # biru
-    return True  # hitam, abu-abu, merah, hijau, dll = jangan ikutkan
-
-
-def _as_list(val, default=None):
-    """Pastikan nilai bisa di-iterate sebagai list."""
-    if default is None:
-        default = []
-    if isinstance(val, list):
-        return val
-    if isinstance(val, (tuple, range)):
-        return list(val)
-    return default
+    try:
+        return _classify_color(_color_key(color)) != _COLOR_BLUE
+    except TypeError:
+        return _classify_color.__wrapped__(color) != _COLOR_BLUE
 
 
-def _span_to_item(span: dict, page_num: int) -> dict:
-    raw_size = span.get("size", 12)
+def _coerce_size(raw_size) -> float:
+    """Normalisasi size span ke float (jalur lambat; size hampir selalu sudah float)."""
     try:
-        size = float(raw_size) if raw_size is not None else 12
+        return float(raw_size) if raw_size is not None else 12
     except (TypeError, ValueError):
-        size = 12
-    bbox = span.get("bbox")
-    if isinstance(bbox, (list, tuple)) and len(bbox) >= 4:
-        x0, y0, x1, y1 = float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3])
-    else:
-        x0 = y0 = x1 = y1 = 0
-    return {
-        "text": (span.get("text") or "").strip(),
-        "size": size,
-        "font": span.get("font", "helv"),
-        "page": page_num + 1,
-        "bbox": (x0, y0, x1, y1),
-    }
+        return 12
 
 
-def _flush_paragraph(current: list[dict], out: list[dict]) -> None:
-    """Gabungkan semua span di current jadi satu paragraf, append ke out."""
-    if not current:
-        return
-    lines = [it["text"] for it in current if it["text"]]
-    if not lines:
+class SpanItem:
+    """Satu span teks hasil ekstraksi. __slots__ memangkas memori per span dan
+    mengganti lookup hash dict dengan akses atribut di semua pass hilir."""
+
+    __slots__ = ("text", "size", "font", "page", "bbox", "is_blue")
+
+    def __init__(self, text, size, font, page, bbox, is_blue=False):
+        self.text = text
+        self.size = size
+        self.font = font
+        self.page = page
+        self.bbox = bbox
+        self.is_blue = is_blue
+
+
+def _flush_paragraph(first: SpanItem, fragments: list[str], out: list[dict]) -> None:
+    """Gabungkan fragmen teks satu paragraf (sudah terfilter non-kosong) jadi
+    satu item; metadata diambil dari span pertama paragraf."""
+    if not fragments:
         return
-    merged = "\n".join(lines)
     out.append({
-        "text": merged,
-        "size": current[0]["size"],
-        "font": current[0]["font"],
-        "page": current[0]["page"],
+        "text": "\n".join(fragments),
+        "size": first.size,
+        "font": first.font,
+        "page": first.page,
     })
 
 
-def extract_blue_text_from_pdf(input_path: str) -> list[dict]:
+# Di bawah ini jumlah halaman minimum sebelum ekstraksi paralel dipakai:
+# untuk dokumen kecil overhead thread + buka ulang dokumen > keuntungannya.
+PARALLEL_PAGE_MIN = 8
+
+
+def _extract_page(page, page_num: int) -> tuple[list[dict], list[SpanItem], list[SpanItem]]:
+    """Proses satu halaman: (paragraf biru, span biru ber-bbox, semua span ber-bbox).
+    Tidak menyentuh state bersama — aman dipanggil per halaman dari worker."""
+    blue_out = []
+    all_out = []
+    span_items = []   # semua item span, urut dokumen
+    span_blue = []    # flag biru per span (paralel dengan span_items)
+    span_block = []   # id blok per span (paralel dengan span_items)
+    blocks = page.get_text("dict", sort=True, flags=TEXT_EXTRACT_FLAGS).get("blocks") or ()
+    for block_id, block in enumerate(blocks):
+        # Dengan flags di atas hanya blok teks yang dihasilkan
+        for line in block.get("lines") or ():
+            if not isinstance(line, dict):
+                continue
+            for span in line.get("spans") or ():
+                if not isinstance(span, dict):
+                    continue
+                is_blue = is_blue_color(span.get("color"))
+                # Inline _span_to_item: hindari satu frame Python per span
+                text = (span.get("text") or "").strip()
+                raw_size = span.get("size", 12)
+                item = SpanItem(
+                    text,
+                    raw_size if type(raw_size) is float else _coerce_size(raw_size),
+                    span.get("font", "helv"),
+                    page_num + 1,
+                    span.get("bbox") or (0, 0, 0, 0),
+                    is_blue,
+                )
+                if text:
+                    all_out.append(item)
+                if is_blue and text:
+                    blue_out.append(item)
+                span_items.append(item)
+                span_blue.append(is_blue)
+                span_block.append(block_id)
+    # Rakit paragraf secara vektor: satu paragraf = run span biru berurutan di
+    # dalam satu blok. Batas run dihitung NumPy, bukan state machine per span.
+    blue_paragraphs = []
+    blue_idx = np.flatnonzero(np.asarray(span_blue, dtype=bool))
+    if blue_idx.size:
+        block_arr = np.asarray(span_block, dtype=np.int32)
+        starts = np.ones(blue_idx.size, dtype=bool)
+        starts[1:] = (np.diff(blue_idx) != 1) | (block_arr[blue_idx[1:]] != block_arr[blue_idx[:-1]])
+        bounds = np.flatnonzero(starts)
+        for a, b in zip(bounds, np.append(bounds[1:], blue_idx.size)):
+            run = blue_idx[a:b]
+            # Kumpulkan fragmen teks saja (filter kosong di sini), join sekali
+            fragments = [t for t in (span_items[j].text for j in run) if t]
+            _flush_paragraph(span_items[run[0]], fragments, blue_paragraphs)
+    return blue_paragraphs, blue_out, all_out
+
+
+def _open_pdf(source):
+    """Buka PDF dari path (str) atau langsung dari memori (bytes/BytesIO)."""
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _extract_page_range(source, page_nums: range) -> list:
+    """Worker: buka Document sendiri (satu Document PyMuPDF tidak boleh dipakai
+    lintas thread) lalu proses subset halaman secara berurutan."""
+    doc = _open_pdf(source)
+    try:
+        return [_extract_page(doc[n], n) for n in page_nums]
+    finally:
+        doc.close()
+
+
+# Cache hasil extract_all untuk satu file terakhir: endpoint upload memanggil
+# build_table_with_header_from_pdf lalu extract_blue_spans_with_bbox pada PDF
+# yang sama — tanpa cache, dokumen diparse dua kali. Kunci menyertakan mtime
+# agar file temp yang kebetulan bernama sama tidak salah pakai hasil lama.
+_EXTRACT_CACHE: dict = {}
+
+
+def extract_all(source) -> tuple[list[dict], list[SpanItem], list[SpanItem]]:
+    """Satu traversal dokumen untuk tiga output sekaligus:
+    (paragraf biru, span biru ber-bbox, semua span ber-bbox).
+    `source` boleh path (str) atau isi PDF di memori (bytes/BytesIO) — upload
+    diparse langsung tanpa lewat file temp. get_text("dict") adalah biaya
+    terbesar per halaman — jangan diulang tiga kali untuk dokumen yang sama;
+    untuk dokumen besar halaman diproses paralel (get_text melepas GIL di
+    dalam kode C MuPDF). Hasil di-cache per (path, mtime) atau per isi bytes
+    sehingga pemanggilan berulang pada dokumen yang sama gratis.
+    """
+    if isinstance(source, BytesIO):
+        source = source.getvalue()
+    if isinstance(source, str):
+        try:
+            cache_key = (source, os.path.getmtime(source))
+        except OSError:
+            cache_key = None
+    else:
+        # bytes: kunci dari panjang + hash supaya blob tidak ikut tersimpan di kunci
+        cache_key = (len(source), hash(source))
+    if cache_key is not None and cache_key in _EXTRACT_CACHE:
+        return _EXTRACT_CACHE[cache_key]
+    doc = _open_pdf(source)
+    page_count = len(doc)
+    workers = min(os.cpu_count() or 1, page_count)
+    if page_count < PARALLEL_PAGE_MIN or workers < 2:
+        doc.close()
+        per_page = iter_extract_pages(source)
+    else:
+        doc.close()
+        # Bagi halaman jadi blok kontigu per worker; hasil digabung urut halaman
+        chunk = (page_count + workers - 1) // workers
+        ranges = [range(i, min(i + chunk, page_count)) for i in range(0, page_count, chunk)]
+        per_page = []
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            for part in executor.map(lambda r: _extract_page_range(source, r), ranges):
+                per_page.extend(part)
+    blue_paragraphs = []
+    blue_out = []
+    all_out = []
+    for paragraphs, blue_part, all_part in per_page:
+        blue_paragraphs.extend(paragraphs)
+        blue_out.extend(blue_part)
+        all_out.extend(all_part)
+    result = (blue_paragraphs, blue_out, all_out)
+    if cache_key is not None:
+        _EXTRACT_CACHE.clear()  # cukup satu entri: tiap upload = file temp baru
+        _EXTRACT_CACHE[cache_key] = result
+    return result
+
+
+def iter_extract_pages(source):
+    """Generator per halaman: yield (paragraf biru, span biru, semua span) satu
+    halaman sekaligus. Memori puncak dibatasi satu halaman — pakai ini untuk
+    PDF sangat besar ketika tiga daftar penuh tidak dibutuhkan sekaligus."""
+    doc = _open_pdf(source)
+    try:
+        for page_num in range(len(doc)):
+            yield _extract_page(doc[page_num], page_num)
+    finally:
+        doc.close()
+
+
+def iter_blue_spans_with_bbox(source):
+    """Generator span biru ber-bbox, urut dokumen, tanpa membangun list penuh."""
+    for _paragraphs, blue_part, _all_part in iter_extract_pages(source):
+        yield from blue_part
+
+
+def iter_blue_paragraphs(source):
+    """Generator paragraf biru per halaman, tanpa membangun list seluruh dokumen.
+    Pakai ini untuk menulis output secara streaming pada PDF sangat besar."""
+    for paragraphs, _blue_part, _all_part in iter_extract_pages(source):
+        yield from paragraphs
+
+
+def extract_blue_text_from_pdf(source) -> list[dict]:
     """Baca PDF, kembalikan list paragraf biru. Satu paragraf = satu blok teks
     (banyak baris digabung). Span dalam blok yang sama digabung jadi satu item.
     Nomor halaman diambil dari halaman yang sedang diproses (page_num).
     """
-    doc = fitz.open(input_path)
-    blue_spans = []
-    current_paragraph = []
-    in_blue_paragraph = False
-    for page_num in range(len(doc)):
-        # Flush sisa paragraf dari halaman sebelumnya (jangan campur halaman)
-        _flush_paragraph(current_paragraph, blue_spans)
-        current_paragraph = []
-        in_blue_paragraph = False
-
-        page = doc[page_num]
-        blocks = _as_list(page.get_text("dict", sort=True).get("blocks"))
-        for block in blocks:
-            if not isinstance(block, dict) or block.get("type") != 0:
-                continue
-            _flush_paragraph(current_paragraph, blue_spans)
-            current_paragraph = []
-            in_blue_paragraph = False
-            for line in _as_list(block.get("lines")):
-                if not isinstance(line, dict):
-                    continue
-                for span in _as_list(line.get("spans")):
-                    if not isinstance(span, dict):
-                        continue
-                    color = span.get("color")
-                    if is_blue_color(color):
-                        in_blue_paragraph = True
-                        current_paragraph.append(_span_to_item(span, page_num))
-                    elif in_blue_paragraph and not is_explicitly_other_color(color):
-                        current_paragraph.append(_span_to_item(span, page_num))
-                    else:
-                        _flush_paragraph(current_paragraph, blue_spans)
-                        current_paragraph = []
-                        in_blue_paragraph = False
-            _flush_paragraph(current_paragraph, blue_spans)
-            current_paragraph = []
-    _flush_paragraph(current_paragraph, blue_spans)
-    doc.close()
-    return blue_spans
+    return extract_all(source)[0]
 
 
-def extract_blue_spans_with_bbox(input_path: str) -> list[dict]:
+def extract_blue_spans_with_bbox(source) -> list[SpanItem]:
     """Ekstrak semua span biru beserta bbox (x0,y0,x1,y1) dan page, tanpa menggabung paragraf."""
-    doc = fitz.open(input_path)
-    out = []
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        blocks = _as_list(page.get_text("dict", sort=True).get("blocks"))
-        for block in blocks:
-            if not isinstance(block, dict) or block.get("type") != 0:
-                continue
-            for line in _as_list(block.get("lines")):
-                if not isinstance(line, dict):
-                    continue
-                for span in _as_list(line.get("spans")):
-                    if not isinstance(span, dict):
-                        continue
-                    if not is_blue_color(span.get("color")):
-                        continue
-                    item = _span_to_item(span, page_num)
-                    if item["text"]:
-                        out.append(item)
-    doc.close()
-    return out
+    return extract_all(source)[1]
 
 
-def extract_all_spans_with_bbox(input_path: str) -> list[dict]:
+def extract_all_spans_with_bbox(source) -> list[SpanItem]:
     """Ekstrak SEMUA span (biru dan non-biru) beserta bbox dan page, untuk deteksi header tabel."""
-    doc = fitz.open(input_path)
-    out = []
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        blocks = _as_list(page.get_text("dict", sort=True).get("blocks"))
-        for block in blocks:
-            if not isinstance(block, dict) or block.get("type") != 0:
-                continue
-            for line in _as_list(block.get("lines")):
-                if not isinstance(line, dict):
-                    continue
-                for span in _as_list(line.get("spans")):
-                    if not isinstance(span, dict):
-                        continue
-                    item = _span_to_item(span, page_num)
-                    item["is_blue"] = is_blue_color(span.get("color"))
-                    if item["text"]:
-                        out.append(item)
-    doc.close()
-    return out
+    return extract_all(source)[2]
 
 
 # Toleransi untuk mengelompokkan baris (pts) dan jarak minimal untuk kolom baru (pts).
@@ -288,28 +433,64 @@ CORE_HEADER_KEYWORDS = (
 )
 
 
-def _row_text_lower(row_spans: list[dict]) -> str:
+# Alternation regex (alternatif terpanjang lebih dulu) supaya hitung kata kunci
+# header jadi satu pass C-level, bukan ~21 substring-scan Python per baris.
+HEADER_KW_RE = re.compile("|".join(re.escape(k) for k in sorted(HEADER_KEYWORDS, key=len, reverse=True)))
+CORE_KW_RE = re.compile("|".join(re.escape(k) for k in sorted(CORE_HEADER_KEYWORDS, key=len, reverse=True)))
+
+# Opsional: pyahocorasick mencocokkan semua kata kunci dalam satu pass linear
+# terhadap panjang teks, terlepas dari jumlah kata kunci. Tanpa paket itu,
+# alternation regex di atas tetap dipakai.
+try:
+    import ahocorasick
+
+    HEADER_KW_AUTOMATON = ahocorasick.Automaton()
+    for _kw in HEADER_KEYWORDS:
+        HEADER_KW_AUTOMATON.add_word(_kw, _kw)
+    HEADER_KW_AUTOMATON.make_automaton()
+except ImportError:
+    HEADER_KW_AUTOMATON = None
+
+
+def _row_text_lower(row_spans: list[SpanItem]) -> str:
     """Gabung teks semua span di baris jadi satu string lowercase."""
-    parts = [ (s.get("text") or "").strip() for s in row_spans ]
+    parts = [s.text for s in row_spans]  # text sudah di-strip saat ekstraksi
     return " ".join(parts).lower()
 
 
-def _row_cell_count(row_spans: list[dict]) -> int:
+def _row_cell_count(row_spans: list[SpanItem]) -> int:
     """Hitung jumlah 'kolom' di baris (span yang terpisah jarak > COLUMN_X_GAP)."""
-    if not row_spans:
+    n = len(row_spans)
+    if not n:
         return 0
-    count = 1
-    last_x1 = None
-    for s in row_spans:
-        bbox = s.get("bbox") or (0, 0, 0, 0)
-        x0, x1 = bbox[0], bbox[2]
-        if last_x1 is not None and (x0 - last_x1) > COLUMN_X_GAP:
-            count += 1
-        last_x1 = x1
-    return count
-
-
-def _row_looks_like_header(row_spans: list[dict]) -> bool:
+    x0s = np.fromiter((s.bbox[0] for s in row_spans), dtype=np.float64, count=n)
+    x1s = np.fromiter((s.bbox[2] for s in row_spans), dtype=np.float64, count=n)
+    return 1 + int(np.count_nonzero(x0s[1:] - x1s[:-1] > COLUMN_X_GAP))
+
+
+@functools.lru_cache(maxsize=1024)
+def _header_check_cached(text: str) -> bool:
+    """Bagian tekstual dari deteksi header, di-memoize per teks baris.
+
+    Header yang sama muncul berulang di tiap halaman PDF, jadi scan kata kunci
+    penuh cukup dijalankan sekali per teks unik.
+    """
+    # Early-exit murah: baris terlalu pendek atau tanpa huruf mustahil header.
+    if len(text) < 3 or not _RE_ALPHA.search(text):
+        return False
+    if CORE_KW_RE.search(text) is None:
+        return False
+    # Tolak baris yang hanya sub-header tanggal (Kepemilikan Per 28-JAN-2026) tanpa kolom utama
+    if "kepemilikan per" in text and not any(kw in text for kw in ("nama emiten", "kode efek", "nama pemegang", "no. urut", "no. aodi")):
+        return False
+    if HEADER_KW_AUTOMATON is not None:
+        matches = sum(1 for _ in HEADER_KW_AUTOMATON.iter(text))
+    else:
+        matches = len(HEADER_KW_RE.findall(text))
+    return matches >= MIN_HEADER_KEYWORD_MATCHES
+
+
+def _row_looks_like_header(row_spans: list[SpanItem]) -> bool:
     """
     True jika baris mirip header tabel LENGKAP (No, Kode Efek, Nama Emiten, Alamat, ...):
     - HARUS mengandung minimal 1 kata kunci inti (No/Kode Efek/Nama Emiten/Nama Pemegang ...),
@@ -317,42 +498,45 @@ def _row_looks_like_header(row_spans: list[dict]) -> bool:
     - minimal MIN_HEADER_CELLS kolom,
     - BUKAN baris yang hanya "Kepemilikan Per DD-MMM-YYYY" (sub-header tanggal saja).
     """
-    text = _row_text_lower(row_spans)
-    if not text or len(text) < 3:
-        return False
-    if not any(kw in text for kw in CORE_HEADER_KEYWORDS):
-        return False
-    # Tolak baris yang hanya sub-header tanggal (Kepemilikan Per 28-JAN-2026) tanpa kolom utama
-    if "kepemilikan per" in text and not any(kw in text for kw in ("nama emiten", "kode efek", "nama pemegang", "no. urut", "no. aodi")):
-        return False
-    matches = sum(1 for kw in HEADER_KEYWORDS if kw in text)
-    if matches < MIN_HEADER_KEYWORD_MATCHES:
+    if not _header_check_cached(_row_text_lower(row_spans)):
         return False
     if _row_cell_count(row_spans) < MIN_HEADER_CELLS:
         return False
     return True
 
 
+# Tabel translate & pola precompiled untuk klasifikasi bentuk teks sel.
+# Fungsi _looks_like_* dipanggil 5-10x per baris data di pipeline koreksi,
+# jadi rantai .replace()/per-char comprehension diganti operasi C-level tunggal.
+_STRIP_SEPS = str.maketrans("", "", ", .")       # koma, spasi, titik (pemisah ribuan)
+_STRIP_COMMA_SPACE = str.maketrans("", "", ", ")
+_STRIP_COMMA = str.maketrans("", "", ",")
+_RE_STOCK_CODE = re.compile(r"(?:[^\W_]|[.\-])+")  # alfanumerik + . dan -
+_RE_ALPHA = re.compile(r"[^\W\d_]")
+_WS_RE = re.compile(r"\s+")  # normalisasi spasi: satu substitusi C-level, tanpa list dari .split()                # satu huruf (unicode-aware)
+
+
+@functools.lru_cache(maxsize=4096)
 def _looks_like_stock_code(s: str) -> bool:
     """True jika teks mirip kode saham (singkat, huruf besar, alfanumerik)."""
     if not s or len(s) > 10:
         return False
     t = s.strip().upper()
-    if len(t) < 2:
+    if len(t) < 2 or t.isdigit():
         return False
-    if t.isdigit():
-        return False
-    return all(c.isalnum() or c in ".-" for c in t)
+    return _RE_STOCK_CODE.fullmatch(t) is not None
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_no(s: str) -> bool:
     """True jika teks mirip nomor urut (angka saja, boleh dengan koma)."""
     if not s:
         return False
-    t = s.strip().replace(",", "").replace(" ", "")
-    return t.isdigit() and len(t) <= 6
+    t = s.strip().translate(_STRIP_COMMA_SPACE)
+    return len(t) <= 6 and t.isdigit()
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_company_name(s: str) -> bool:
     """True jika teks mirip nama emiten (panjang, ada Tbk/PT)."""
     if not s or len(s) < 10:
@@ -374,7 +558,7 @@ def _split_rows_duplicate_numeric(raw_data_rows: list[tuple], num_cols: int) ->
     result = []
     for row_meta in raw_data_rows:
         cluster_y, cells, page = (row_meta[0], list(row_meta[1]) if len(row_meta) > 1 else [], row_meta[2] if len(row_meta) > 2 else row_meta[0])
-        cells = (cells + [""] * num_cols)[:num_cols]
+        _pad_inplace(cells, num_cols, "")
         parts_by_col = {}
         has_duplicate = False
         for j in range(idx_start, idx_end):
@@ -424,27 +608,50 @@ def _merge_split_kode_emiten_rows(raw_data_rows: list[tuple], num_cols: int) ->
     - Pattern A: baris i kolom 1 = Nama Emiten (salah), kolom 2 kosong; baris berikut ada Kode Efek → pindah Nama Emiten ke kolom 2, isi kolom 1 dengan Kode Efek.
     - Pattern B: baris i kolom 1 = Kode Efek, kolom 2 kosong; baris berikut kolom 1 = Nama Emiten → isi kolom 2 dengan Nama Emiten dari baris berikut.
     Jangan gabung jika baris berikut punya data numerik sendiri (Jumlah Saham (1)/(2), Perubahan berbeda), mis. No 318 atas vs 318 bawah.
+    Klasifikasi kode-efek/nama-emiten per baris dihitung sekali di muka agar
+    lookahead O(n·k) tidak mengulang predikat yang sama.
     """
     if num_cols < 3:
         return raw_data_rows
     idx_numeric_start = 11
     idx_numeric_end = min(18, num_cols)
+    n = len(raw_data_rows)
+
+    # Precompute per baris: cells ter-pad + kolom 0/1/2 + hasil predikat kolom 1
+    padded = []
+    col0s = []
+    col1s = []
+    col2s = []
+    col1_is_stock = []
+    col1_is_company = []
+    for row_meta in raw_data_rows:
+        cells = _pad_inplace(list(row_meta[1]) if len(row_meta) > 1 else [], num_cols, "")
+        c0 = (cells[0] if len(cells) > 0 else "").strip()
+        c1 = (cells[1] or "").strip()
+        c2 = (cells[2] if len(cells) > 2 else "").strip()
+        padded.append(cells)
+        col0s.append(c0)
+        col1s.append(c1)
+        col2s.append(c2)
+        col1_is_stock.append(bool(c1) and _looks_like_stock_code(c1))
+        col1_is_company.append(bool(c1) and _looks_like_company_name(c1))
+
     result = []
     i = 0
-    while i < len(raw_data_rows):
+    while i < n:
         row_meta = raw_data_rows[i]
-        cells = list((row_meta[1] if len(row_meta) > 1 else []) + [""] * num_cols)[:num_cols]
-        col0 = (cells[0] if len(cells) > 0 else "").strip()
-        col1 = (cells[1] or "").strip()
-        col2 = (cells[2] if len(cells) > 2 else "").strip()
+        cells = padded[i]
+        col0 = col0s[i]
+        col1 = col1s[i]
+        col2 = col2s[i]
 
         merged = False
         # Cari baris berikut (hingga 3 baris ke depan) untuk pola terpecah
-        for k in range(1, min(4, len(raw_data_rows) - i)):
-            next_meta = raw_data_rows[i + k]
-            next_cells = list((next_meta[1] if len(next_meta) > 1 else []) + [""] * num_cols)[:num_cols]
-            next_col0 = (next_cells[0] if len(next_cells) > 0 else "").strip()
-            next_col1 = (next_cells[1] if len(next_cells) > 1 else "").strip()
+        for k in range(1, min(4, n - i)):
+            j_next = i + k
+            next_cells = padded[j_next]
+            next_col0 = col0s[j_next]
+            next_col1 = col1s[j_next]
             same_entity = (not next_col0 or next_col0 == col0)
 
             # Jangan gabung jika baris berikut punya data numerik sendiri (mis. 318 bawah: 2,000,000 vs 318 atas)
@@ -464,9 +671,9 @@ def _merge_split_kode_emiten_rows(raw_data_rows: list[tuple], num_cols: int) ->
             if (
                 col1
                 and not col2
-                and _looks_like_company_name(col1)
+                and col1_is_company[i]
                 and next_col1
-                and _looks_like_stock_code(next_col1)
+                and col1_is_stock[j_next]
                 and same_entity
             ):
                 cells[1] = next_col1
@@ -485,9 +692,9 @@ def _merge_split_kode_emiten_rows(raw_data_rows: list[tuple], num_cols: int) ->
             if (
                 col1
                 and not col2
-                and _looks_like_stock_code(col1)
+                and col1_is_stock[i]
                 and next_col1
-                and _looks_like_company_name(next_col1)
+                and col1_is_company[j_next]
                 and same_entity
             ):
                 cells[2] = next_col1
@@ -560,13 +767,14 @@ def _fix_kode_emiten_cells(cells: list, num_cols: int) -> None:
             cells[2] = col1
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_percentage_value(s: str) -> bool:
     """True jika nilai mirip persentase (desimal seperti 5.00, 11.70), bukan bilangan bulat seperti 343 atau 0."""
-    if not s or s.strip() == "-":
-        return False
-    s = s.strip().replace(",", "")
     if not s:
         return False
+    s = s.strip().translate(_STRIP_COMMA)
+    if not s or s == "-":
+        return False
     try:
         v = float(s)
         # Persentase biasanya 0–100 dengan desimal; bilangan bulat besar (343) atau 0 = Perubahan
@@ -579,32 +787,32 @@ def _looks_like_percentage_value(s: str) -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_text_not_number(s: str) -> bool:
     """True jika nilai jelas teks (nama, alamat, negara): ada huruf dan bukan murni angka/desimal."""
     if not s or s.strip() == "-":
         return False
     t = s.strip()
     # Angka dengan koma/point saja = bukan teks
-    cleaned = t.replace(",", "").replace(".", "").replace(" ", "")
-    if cleaned.isdigit():
+    if t.translate(_STRIP_SEPS).isdigit():
         return False
     # Nilai desimal murni (5.02, 11.76) = bukan teks
     if _looks_like_percentage_value(t):
         return False
     # Ada huruf dan panjang > 2 = teks (nama, alamat, dll)
-    return any(c.isalpha() for c in t) and len(t) > 2
+    return len(t) > 2 and _RE_ALPHA.search(t) is not None
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_large_number(s: str) -> bool:
     """True jika nilai mirip bilangan besar (jumlah saham): angka dengan/tanpa koma atau titik (pemisah ribuan)."""
     if not s or s.strip() == "-":
         return False
-    t = s.strip().replace(",", "").replace(" ", "").replace(".", "")  # titik/koma pemisah ribuan
-    if not t.isdigit():
-        return False
-    return len(t) >= 4  # minimal orde ribuan
+    t = s.strip().translate(_STRIP_SEPS)  # titik/koma pemisah ribuan
+    return len(t) >= 4 and t.isdigit()  # minimal orde ribuan
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_address_or_wrong_text(s: str) -> bool:
     """True jika nilai mirip alamat atau teks yang salah tempat (bukan angka untuk Jumlah Saham/Saham Gabungan)."""
     if not s or s.strip() == "-":
@@ -619,6 +827,7 @@ def _looks_like_address_or_wrong_text(s: str) -> bool:
     return len(s) > 30 and "," in s
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_change_value(s: str) -> bool:
     """True jika nilai mirip kolom Perubahan: angka kecil, 0, atau '-'."""
     if not s:
@@ -626,7 +835,7 @@ def _looks_like_change_value(s: str) -> bool:
     t = s.strip()
     if t == "-":
         return True
-    t = t.replace(",", "").replace(" ", "")
+    t = t.translate(_STRIP_COMMA_SPACE)
     if not t.isdigit():
         return False
     return int(t) >= 0 and len(t) <= 15  # angka wajar untuk perubahan
@@ -746,7 +955,7 @@ def _fix_perubahan_split_percentage_then_number(cells: list, num_cols: int) -> N
     if not _looks_like_percentage_value(first):
         return
     # Second bisa angka besar (2.703.857.638), dengan koma (6,784,500), atau 0
-    second_clean = second.replace(",", "").replace(".", "").replace(" ", "")
+    second_clean = second.translate(_STRIP_SEPS)
     if not second_clean or not second_clean.isdigit():
         return
     while len(cells) <= idx_perubahan:
@@ -755,27 +964,31 @@ def _fix_perubahan_split_percentage_then_number(cells: list, num_cols: int) -> N
     cells[idx_perubahan] = second
 
 
+# Kata kunci nama perusahaan/securities, digabung jadi satu alternation regex
+# (substring match, tanpa \b: "PT" memang sengaja cocok di mana saja — sama
+# dengan perilaku `kw in t_upper` sebelumnya).
+_SEC_KW_RE = re.compile("|".join(re.escape(k) for k in sorted(
+    ("SEKURITAS", "ASSET", "PT", "PT.", "LTD", "S/A", "INTERNATIONAL", "INDONESIA",
+     "MIRAE", "MANDIRI", "SINARMAS", "CGS", "AJAIB", "INDOVEST", "ABADIMUKTI"),
+    key=len, reverse=True)))
+
+
+@functools.lru_cache(maxsize=4096)
 def _looks_like_securities_name(s: str) -> bool:
     """True jika teks mirip nama rekening efek/securities (mengandung PT, SEKURITAS, ASSET, dll)."""
-    if not s or s.strip() == "-":
+    if not s:
         return False
     t = s.strip()
     if len(t) < 5:
         return False
-    t_upper = t.upper()
-    # Kata kunci yang menunjukkan nama perusahaan/securities
-    keywords = ["SEKURITAS", "ASSET", "PT", "PT.", "LTD", "S/A", "INTERNATIONAL", "INDONESIA", 
-                "MIRAE", "MANDIRI", "SINARMAS", "CGS", "AJAIB", "INDOVEST", "ABADIMUKTI"]
-    # Jika mengandung kata kunci perusahaan DAN bukan angka/persen
-    has_keyword = any(kw in t_upper for kw in keywords)
-    if has_keyword and not _looks_like_percentage_value(t) and not _looks_like_large_number(t):
-        return True
-    # Atau jika mengandung "PT" atau "PT." di awal atau tengah
-    if ("PT" in t_upper or "PT." in t_upper) and len(t) > 5:
-        return not _looks_like_percentage_value(t) and not _looks_like_large_number(t)
-    return False
+    # Satu search C-level menggantikan ~15 substring-scan; predikat numerik
+    # cukup dievaluasi sekali dan hanya bila ada kata kunci.
+    if _SEC_KW_RE.search(t.upper()) is None:
+        return False
+    return not _looks_like_percentage_value(t) and not _looks_like_large_number(t)
 
 
+@functools.lru_cache(maxsize=4096)
 def _looks_like_person_name(s: str) -> bool:
     """True jika teks mirip nama orang (huruf kapital, beberapa kata, tidak mengandung PT/SEKURITAS)."""
     if not s or s.strip() == "-":
@@ -790,12 +1003,12 @@ def _looks_like_person_name(s: str) -> bool:
     if len(words) < 2:
         return False
     # Setidaknya 2 kata dan mengandung huruf, bukan angka/persen
-    has_letters = any(c.isalpha() for c in t)
+    has_letters = _RE_ALPHA.search(t) is not None
     is_not_number = not _looks_like_percentage_value(t) and not _looks_like_large_number(t) and not _looks_like_change_value(t)
     # Nama orang biasanya tidak terlalu panjang (maks ~50 karakter)
     reasonable_length = len(t) <= 50
     # Setiap kata harus mengandung huruf (bukan hanya angka/tanda baca)
-    all_words_have_letters = all(any(c.isalpha() for c in word) for word in words)
+    all_words_have_letters = all(_RE_ALPHA.search(word) for word in words)
     # Contoh: "ANDRIANSYAH PRAYITNO" - 2 kata, huruf semua, panjang wajar
     # Contoh: "ADITYA ANTONIUS" - 2 kata, huruf semua
     return has_letters and is_not_number and reasonable_length and len(words) >= 2 and all_words_have_letters
@@ -815,8 +1028,22 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
     idx_perubahan = 17
     block_start, block_end = 11, 18  # 11..17
 
+    # View sel yang sudah di-strip, di-cache per indeks; setcell menjaga cache
+    # tetap sinkron sehingga nilai yang sama tidak di-strip berulang kali.
+    _stripped: dict[int, str] = {}
+
     def get(i: int) -> str:
-        return (cells[i] if i < len(cells) else "").strip() or "-"
+        v = _stripped.get(i)
+        if v is None:
+            v = (cells[i] if i < len(cells) else "").strip() or "-"
+            _stripped[i] = v
+        return v
+
+    def setcell(i: int, v: str) -> None:
+        while len(cells) <= i:
+            cells.append("-")
+        cells[i] = v
+        _stripped[i] = (v or "").strip() or "-"
 
     # Perubahan berisi "36.67 2.703.857.638" atau "5.24 6,784,500" → pisah, persen ke Persentase (2)
     _fix_perubahan_split_percentage_then_number(cells, num_cols)
@@ -831,9 +1058,7 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
             break
         val_jar = get(idx_jar)
         if val_jar != "-" and _looks_like_address_or_wrong_text(val_jar):
-            while len(cells) <= idx_jar:
-                cells.append("-")
-            cells[idx_jar] = "-"
+            setcell(idx_jar, "-")
 
     # Jika Persentase (1) berisi teks (nama rekening efek, nama pemegang saham dll), cari nilai persen di SELURUH BARIS
     val13 = get(idx_pct1)
@@ -848,15 +1073,15 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
             if j == idx_pct1 or j == idx_pct2:  # Skip kolom persen lainnya
                 continue
             if _looks_like_percentage_value(get(j)):
-                cells[idx_pct1], cells[j] = get(j), val13
+                _swap_v = get(j)
+                setcell(j, val13)
+                setcell(idx_pct1, _swap_v)
                 swapped = True
                 break
         # Jika tidak ada nilai persen yang ditemukan, set ke "-" HANYA jika jelas teks (nama/securities)
         # Jangan set ke "-" jika mungkin angka besar yang salah tempat
         if not swapped and (_looks_like_securities_name(val13) or _looks_like_person_name(val13)):
-            while len(cells) <= idx_pct1:
-                cells.append("-")
-            cells[idx_pct1] = "-"
+            setcell(idx_pct1, "-")
     
     # Jika Persentase (1) kosong ("-") atau berisi angka besar yang salah, cari nilai persen di seluruh baris
     val13_after = get(idx_pct1)
@@ -869,14 +1094,16 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
             if _looks_like_percentage_value(val_j):
                 # Jika Persentase (1) kosong, pindahkan persen ke sana
                 if val13_after == "-":
-                    cells[idx_pct1] = val_j
+                    setcell(idx_pct1, val_j)
                     if j == idx_perubahan:  # Jika dari Perubahan, kosongkan Perubahan
-                        cells[idx_perubahan] = "-"
+                        setcell(idx_perubahan, "-")
                     else:
-                        cells[j] = "-"
+                        setcell(j, "-")
                 # Jika Persentase (1) berisi angka besar, tukar dengan persen
                 elif _looks_like_large_number(val13_after):
-                    cells[idx_pct1], cells[j] = val_j, val13_after
+                    _swap_v = val_j
+                    setcell(j, val13_after)
+                    setcell(idx_pct1, _swap_v)
                 break
 
     # KOREKSI KHUSUS: Hanya jika Persentase (1) berisi persen dan Persentase (2) kosong,
@@ -918,10 +1145,8 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
         not has_period1_data and  # TAMBAHAN: periode 1 tidak punya data
         not has_other_percentage):  # Hanya jika TIDAK ada nilai persen lain
         # Pindahkan nilai dari Persentase (1) ke Persentase (2)
-        while len(cells) <= idx_pct2:
-            cells.append("-")
-        cells[idx_pct2] = val13_check
-        cells[idx_pct1] = "-"
+        setcell(idx_pct2, val13_check)
+        setcell(idx_pct1, "-")
     
     # KOREKSI: Jika ada nilai persen di kolom yang salah, pindahkan ke kolom Persentase yang sesuai.
     # Urutan penempatan Persentase (1)/(2) sudah mengikuti kiri-ke-kanan di tahap ekstraksi; di sini hanya perbaiki salah kolom.
@@ -957,14 +1182,14 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
                 continue
             # Jika ada nilai persen di kolom lain (bukan Persentase), pindahkan ke (1)
             if not pct_in_col and pct_idx != idx_pct2:
-                cells[idx_pct1] = pct_str
+                setcell(idx_pct1, pct_str)
                 if pct_idx != idx_perubahan:
-                    cells[pct_idx] = "-"
+                    setcell(pct_idx, "-")
                 break
             # Jika tidak ada nilai persen lain dan Persentase (2) tidak punya data periode 2, ambil dari (2)
             elif pct_in_col and pct_idx == idx_pct2 and not has_period2_data:
-                cells[idx_pct1] = pct_str
-                cells[idx_pct2] = "-"
+                setcell(idx_pct1, pct_str)
+                setcell(idx_pct2, "-")
                 break
     
     # Jika Persentase (2) kosong dan ada nilai persen lain di kolom lain, pindahkan
@@ -983,11 +1208,9 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
                     continue
                 val_j = get(j)
                 if _looks_like_percentage_value(val_j):
-                    while len(cells) <= idx_pct2:
-                        cells.append("-")
-                    cells[idx_pct2] = val_j
+                    setcell(idx_pct2, val_j)
                     if j != idx_perubahan:
-                        cells[j] = "-"
+                        setcell(j, "-")
                     break
         # Jika periode 2 tidak punya data, gunakan logika lama (nilai persen kedua)
         elif len(percentages_found) > 1:
@@ -999,11 +1222,9 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
                 if not pct_in_col or pct_idx != idx_pct1:
                     found_count += 1
                     if found_count == 2:  # Ambil nilai persen kedua
-                        while len(cells) <= idx_pct2:
-                            cells.append("-")
-                        cells[idx_pct2] = pct_str
+                        setcell(idx_pct2, pct_str)
                         if not pct_in_col and pct_idx != idx_perubahan:
-                            cells[pct_idx] = "-"
+                            setcell(pct_idx, "-")
                         break
     
     # PENGECEKAN FINAL: Jika Persentase (1) masih kosong setelah semua koreksi,
@@ -1027,10 +1248,10 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
             val_j = get(j)
             if _looks_like_percentage_value(val_j):
                 # Ambil nilai persen pertama yang ditemukan untuk Persentase (1)
-                cells[idx_pct1] = val_j
+                setcell(idx_pct1, val_j)
                 # Jangan kosongkan kolom sumber jika itu Perubahan atau Persentase (2) dengan data periode 2
                 if j != idx_perubahan and not (j == idx_pct2 and has_period2_data_check):
-                    cells[j] = "-"
+                    setcell(j, "-")
                 break
         
         # PENGECEKAN FINAL: Jika Persentase (2) kosong tapi periode 2 punya data, cari nilai persen untuk (2)
@@ -1047,11 +1268,9 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
                     continue
                 val_j = get(j)
                 if _looks_like_percentage_value(val_j):
-                    while len(cells) <= idx_pct2:
-                        cells.append("-")
-                    cells[idx_pct2] = val_j
+                    setcell(idx_pct2, val_j)
                     if j != idx_perubahan:
-                        cells[j] = "-"
+                        setcell(j, "-")
                     break
 
     # Jika Persentase (2) berisi teks, cari nilai persen di SELURUH BARIS
@@ -1064,14 +1283,14 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
             if j == idx_pct1 or j == idx_pct2:  # Skip kolom persen lainnya
                 continue
             if _looks_like_percentage_value(get(j)):
-                cells[idx_pct2], cells[j] = get(j), val16
+                _swap_v = get(j)
+                setcell(j, val16)
+                setcell(idx_pct2, _swap_v)
                 swapped = True
                 break
         # Jika tidak ada nilai persen yang ditemukan, set ke "-"
         if not swapped:
-            while len(cells) <= idx_pct2:
-                cells.append("-")
-            cells[idx_pct2] = "-"
+            setcell(idx_pct2, "-")
 
     # Jika Perubahan berisi teks (nama pemegang saham dll), lebih agresif
     val17 = get(idx_perubahan)
@@ -1087,14 +1306,14 @@ def _fix_numeric_block_by_content(cells: list, num_cols: int) -> None:
                 continue
             v = get(j)
             if _looks_like_change_value(v) and not _looks_like_large_number(v) and not _looks_like_percentage_value(v):
-                cells[idx_perubahan], cells[j] = v, val17
+                _swap_v = v
+                setcell(j, val17)
+                setcell(idx_perubahan, _swap_v)
                 swapped = True
                 break
         # Jika tidak ada atau jelas nama orang/securities, set ke "-"
         if not swapped or _looks_like_person_name(val17) or _looks_like_securities_name(val17):
-            while len(cells) <= idx_perubahan:
-                cells.append("-")
-            cells[idx_perubahan] = "-"
+            setcell(idx_perubahan, "-")
 
 
 def _fix_persentase_perubahan_cells(cells: list, num_cols: int) -> None:
@@ -1134,23 +1353,75 @@ def _fix_persentase_perubahan_cells(cells: list, num_cols: int) -> None:
     # Jika keduanya sudah terisi, biarkan di Perubahan (mungkin memang untuk Perubahan)
 
 
-def _merge_continuation_rows(rows: list[list], num_cols: int) -> list[list]:
+def _pad_inplace(row: list, n: int, fill: str = "-") -> list:
+    """Pad/potong row ke tepat n sel tanpa list perantara (extend/del in-place)."""
+    short = n - len(row)
+    if short > 0:
+        row.extend([fill] * short)
+    elif short < 0:
+        del row[n:]
+    return row
+
+
+def _normalize_and_fix_row(row: list, num_cols: int) -> list[str]:
+    """Satu sapuan per baris: pad ke num_cols, sel kosong jadi "-", lalu empat
+    koreksi konten (No/Kode Efek, Kode/Nama Emiten, Persentase/Perubahan, blok
+    numerik). Idempoten — baris yang sudah lewat sapuan ini tidak berubah lagi,
+    jadi cukup dijalankan sekali per baris per tahap.
+    """
+    _pad_inplace(row, num_cols, "")
+    normalized = [(str(c).strip() or "-") if c else "-" for c in row]
+    # Koreksi: kolom No jangan terisi kode efek (tukar/pecah/pindah)
+    _fix_no_kode_efek_cells(normalized, num_cols)
+    # Koreksi: jika Kode Efek berisi nama emiten dan Nama Emiten kosong, pindahkan
+    _fix_kode_emiten_cells(normalized, num_cols)
+    # Koreksi: data di kolom Perubahan (18) seharusnya di Persentase Kepemilikan % (17) hanya jika nilai mirip persen
+    _fix_persentase_perubahan_cells(normalized, num_cols)
+    # Koreksi: Persentase (1)/(2) dan Perubahan jangan berisi nama/alamat; tukar dengan nilai yang sesuai di blok 11-17
+    _fix_numeric_block_by_content(normalized, num_cols)
+    return normalized
+
+
+def _pad_and_strip_rows(rows: list[list], num_cols: int) -> tuple[list[list], list[list[str]]]:
+    """Pad tiap baris ke num_cols ("-") dan hitung versi stripped-nya sekali.
+
+    Pass merge/dedupe di bawah membandingkan sel yang sama berkali-kali;
+    tanpa precompute ini tiap perbandingan memanggil str().strip() lagi.
+    """
+    padded = []
+    stripped = []
+    for r in rows:
+        pr = _pad_inplace(r if isinstance(r, list) else (list(r) if r else []), num_cols)
+        padded.append(pr)
+        stripped.append([str(c).strip() if c else "" for c in pr])
+    return padded, stripped
+
+
+def _merge_continuation_rows(rows: list[list], num_cols: int, changed: list[bool] | None = None) -> list[list]:
     """
     Gabungkan baris yang No-nya "-" (baris lanjutan/pecahan) ke baris sebelumnya,
     agar tidak jadi 2–3 baris terpisah. Isi baris lanjutan diisi ke kolom kosong
     baris utama, dari kanan (nilai terakhir isi Perubahan dll).
+    `changed` (opsional, in-place) menandai baris hasil yang isinya dimodifikasi
+    — dipakai pemanggil untuk membatasi koreksi ulang pada baris tersebut saja.
     """
     if num_cols < 2 or not rows:
         return rows
+    # Pad + strip semua baris SEKALI di depan; salinan stripped baris aktif
+    # di-update saat sel terisi, jadi tidak ada str().strip() ulang per pasangan.
+    padded, stripped = _pad_and_strip_rows(rows, num_cols)
     result = []
+    out_changed = []
+    n = len(padded)
     i = 0
-    while i < len(rows):
-        row = list(rows[i]) if rows[i] else []
-        row = (row + ["-"] * num_cols)[:num_cols]
-        while i + 1 < len(rows):
-            next_row = list(rows[i + 1]) if rows[i + 1] else []
-            next_row = (next_row + ["-"] * num_cols)[:num_cols]
-            no_next = (next_row[0] or "").strip()
+    while i < n:
+        row = padded[i]
+        row_s = stripped[i]
+        row_changed = False
+        while i + 1 < n:
+            next_row = padded[i + 1]
+            next_s = stripped[i + 1]
+            no_next = next_s[0]
             if no_next and no_next != "-" and _looks_like_no(no_next):
                 break
             # Jangan merge hanya jika baris lanjutan punya data numerik BEDA dari baris saat ini (baris data baru, mis. 497).
@@ -1159,10 +1430,8 @@ def _merge_continuation_rows(rows: list[list], num_cols: int) -> list[list]:
             idx_numeric_end = min(18, num_cols)
             next_has_different_numeric = False
             for j in range(idx_numeric_start, idx_numeric_end):
-                if j >= len(next_row):
-                    break
-                nv = str(next_row[j] or "").strip()
-                rv = str(row[j] or "").strip()
+                nv = next_s[j]
+                rv = row_s[j]
                 if not nv or nv == "-":
                     continue
                 if not (
@@ -1176,8 +1445,8 @@ def _merge_continuation_rows(rows: list[list], num_cols: int) -> list[list]:
                     break
             if next_has_different_numeric:
                 break
-            empty_idx = [j for j in range(num_cols) if not (row[j] and str(row[j]).strip() and str(row[j]).strip() != "-")]
-            values = [str(next_row[j]).strip() for j in range(num_cols) if next_row[j] and str(next_row[j]).strip() != "-"]
+            empty_idx = [j for j in range(num_cols) if row_s[j] in ("", "-")]
+            values = [next_s[j] for j in range(num_cols) if next_row[j] and next_s[j] != "-"]
             if not values:
                 i += 1
                 continue
@@ -1185,17 +1454,23 @@ def _merge_continuation_rows(rows: list[list], num_cols: int) -> list[list]:
                 start = len(empty_idx) - len(values)
                 for k, v in enumerate(values):
                     row[empty_idx[start + k]] = v
+                    row_s[empty_idx[start + k]] = v
             else:
                 for k, j in enumerate(empty_idx):
                     if k < len(values):
                         row[j] = values[k]
+                        row_s[j] = values[k]
+            row_changed = True
             i += 1
         result.append(row)
+        out_changed.append(row_changed)
         i += 1
+    if changed is not None:
+        changed[:] = out_changed
     return result
 
 
-def _dedupe_rows_fill_kode_efek(rows: list[list], num_cols: int) -> list[list]:
+def _dedupe_rows_fill_kode_efek(rows: list[list], num_cols: int, changed: list[bool] | None = None) -> list[list]:
     """
     Jika dua baris berurutan punya No sama, baris pertama Kode Efek kosong ("-") dan baris kedua
     punya Kode Efek: salin Kode Efek (dan kolom identitas lain yang kosong) ke baris pertama.
@@ -1207,48 +1482,55 @@ def _dedupe_rows_fill_kode_efek(rows: list[list], num_cols: int) -> list[list]:
     # Indeks kolom numerik (18-kolom): 11=Jumlah(1), 12=Saham Gab(1), 13=Persentase(1), 14=Jumlah(2), 15=Saham Gab(2), 16=Persentase(2), 17=Perubahan
     idx_numeric_start = 11
     idx_numeric_end = min(18, num_cols)
+    padded, stripped = _pad_and_strip_rows(rows, num_cols)
+    in_changed = changed if changed is not None and len(changed) == len(rows) else [False] * len(padded)
     result = []
+    out_changed = []
+    n = len(padded)
     i = 0
-    while i < len(rows):
-        row = list(rows[i]) if rows[i] else []
-        row = (row + ["-"] * num_cols)[:num_cols]
-        if i + 1 < len(rows):
-            next_row = list(rows[i + 1]) if rows[i + 1] else []
-            next_row = (next_row + ["-"] * num_cols)[:num_cols]
-            no_cur = (row[0] or "").strip()
-            no_next = (next_row[0] or "").strip()
-            kode_cur = (row[1] or "").strip()
-            kode_next = (next_row[1] or "").strip()
+    while i < n:
+        row = padded[i]
+        row_s = stripped[i]
+        if i + 1 < n:
+            next_row = padded[i + 1]
+            next_s = stripped[i + 1]
+            no_cur = row_s[0]
+            no_next = next_s[0]
+            kode_cur = row_s[1]
+            kode_next = next_s[1]
             if no_cur and no_cur == no_next and (not kode_cur or kode_cur == "-") and kode_next and _looks_like_stock_code(kode_next):
                 # Cek apakah baris kedua punya data numerik sendiri (bukan merge cell)
                 second_has_own_numeric = False
                 for j in range(idx_numeric_start, idx_numeric_end):
-                    if j >= len(next_row):
-                        break
-                    nv = str(next_row[j] or "").strip()
-                    rv = str(row[j] or "").strip()
-                    if nv and nv != "-" and nv != rv:
+                    nv = next_s[j]
+                    if nv and nv != "-" and nv != row_s[j]:
                         second_has_own_numeric = True
                         break
                 if second_has_own_numeric:
                     # Jangan gabung: isi hanya kolom identitas (0–10) di baris pertama yang kosong, pertahankan kedua baris
                     for j in range(1, min(11, num_cols)):
-                        if (not row[j] or str(row[j]).strip() == "-") and j < len(next_row) and next_row[j] and str(next_row[j]).strip() != "-":
+                        if (not row[j] or row_s[j] == "-") and next_row[j] and next_s[j] != "-":
                             row[j] = next_row[j]
                     result.append(row)
                     result.append(next_row)
+                    out_changed.append(True)
+                    out_changed.append(in_changed[i + 1])
                     i += 2
                     continue
                 # Baris kedua redundan: isi semua kolom kosong baris pertama dari baris kedua, buang baris kedua
                 row[1] = kode_next
                 for j in range(2, num_cols):
-                    if (not row[j] or str(row[j]).strip() == "-") and j < len(next_row) and next_row[j] and str(next_row[j]).strip() != "-":
+                    if (not row[j] or row_s[j] == "-") and next_row[j] and next_s[j] != "-":
                         row[j] = next_row[j]
                 i += 2
                 result.append(row)
+                out_changed.append(True)
                 continue
         result.append(row)
+        out_changed.append(in_changed[i])
         i += 1
+    if changed is not None:
+        changed[:] = out_changed
     return result
 
 
@@ -1261,50 +1543,59 @@ def _remove_duplicate_data_rows(raw_data_rows: list[tuple], num_cols: int) -> li
     if not raw_data_rows:
         return raw_data_rows
     result = []
+    prev_key = None
+    prev_hash = None
     for row_meta in raw_data_rows:
-        cells = list((row_meta[1] if len(row_meta) > 1 else []) + [""] * num_cols)[:num_cols]
-        if result:
-            prev_cells = list((result[-1][1] if len(result[-1]) > 1 else []) + [""] * num_cols)[:num_cols]
-            if len(prev_cells) == len(cells) and all(
-                (str(prev_cells[j] or "").strip() == str(cells[j] or "").strip() for j in range(len(cells)))
-            ):
-                continue
+        cells = ((row_meta[1] if len(row_meta) > 1 else []) + [""] * num_cols)[:num_cols]
+        # Strip sekali jadi tuple kunci; bandingkan hash int dulu (murah),
+        # tuple penuh hanya dicek saat hash sama (hindari salah hapus saat kolisi)
+        key = tuple(str(c or "").strip() for c in cells)
+        h = hash(key)
+        if result and h == prev_hash and key == prev_key:
+            continue
         result.append(row_meta)
+        prev_key = key
+        prev_hash = h
     return result
 
 
-def _group_spans_into_rows(span_items: list[dict]) -> list[tuple[float, int, list[dict]]]:
-    """Kelompokkan span jadi baris: (y_mid, page, list span terurut x). Urutkan (page, y)."""
-    if not span_items:
+def _group_spans_into_rows(span_items: list[SpanItem], preserve_order: bool = False) -> list[tuple[float, int, list[SpanItem]]]:
+    """Kelompokkan span jadi baris: (y_mid, page, list span terurut x).
+    Default: sort global (page, y, x). preserve_order=True memakai urutan
+    stream PDF untuk batas baris (hanya isi baris yang di-sort X)."""
+    n = len(span_items)
+    if not n:
         return []
-    def key(s):
-        p = s.get("page", 1)
-        b = s.get("bbox") or (0, 0, 0, 0)
-        y = (b[1] + b[3]) / 2
-        x = b[0]
-        return (p, y, x)
-    sorted_spans = sorted(span_items, key=key)
+    # SoA: tiga array paralel, lalu sort + deteksi batas baris di level C.
+    pages = np.fromiter((s.page for s in span_items), dtype=np.int64, count=n)
+    y_mid = np.fromiter(((s.bbox[1] + s.bbox[3]) * 0.5 for s in span_items), dtype=np.float64, count=n)
+    x0 = np.fromiter((s.bbox[0] for s in span_items), dtype=np.float64, count=n)
+    if preserve_order:
+        # Ikuti urutan stream PDF: batas baris dideteksi pada urutan asli,
+        # hanya isi tiap baris yang diurutkan X (hemat satu sort global dan
+        # tidak mengacak alur baca dokumen multi-kolom).
+        order = np.arange(n)
+        within_row_sort = True
+    else:
+        order = np.lexsort((x0, y_mid, pages))  # stabil, kunci utama = pages
+        within_row_sort = False
+    ps = pages[order]
+    ys = y_mid[order]
+    # Batas baris: pindah halaman atau lompatan Y antar span berurutan > toleransi
+    breaks = np.flatnonzero((np.diff(ps) != 0) | (np.abs(np.diff(ys)) > ROW_Y_TOLERANCE))
+    starts = np.r_[0, breaks + 1]
+    ends = np.r_[breaks + 1, n]
     rows = []
-    current_y = None
-    current_page = None
-    current_row = []
-    for s in sorted_spans:
-        bbox = s.get("bbox") or (0, 0, 0, 0)
-        mid_y = (bbox[1] + bbox[3]) / 2
-        page = s.get("page", 1)
-        if current_y is not None and (page != current_page or abs(mid_y - current_y) > ROW_Y_TOLERANCE):
-            if current_row:
-                rows.append((current_y, current_page, current_row))
-            current_row = []
-        current_y = mid_y
-        current_page = page
-        current_row.append(s)
-    if current_row:
-        rows.append((current_y, current_page, current_row))
+    for a, b in zip(starts, ends):
+        members = [span_items[j] for j in order[a:b]]
+        if within_row_sort:
+            members.sort(key=lambda s: s.bbox[0])
+        # y baris = mid_y span terakhir (sama dengan state machine lama)
+        rows.append((float(ys[b - 1]), int(ps[a]), members))
     return rows
 
 
-def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
+def build_table_with_header_from_pdf(source, correction_level: str = "full") -> list[list[str]]:
     """
     Pendekatan SEDERHANA dan LANGSUNG:
     1. Ambil semua teks biru dari PDF
@@ -1313,8 +1604,14 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     4. Tempatkan ke kolom berdasarkan posisi X relatif terhadap column boundaries dari header
     5. Deteksi merge cell dan duplicate ke semua baris yang ter-merge
     6. Setiap baris HARUS punya 18 kolom (tidak boleh kosong, paling hanya "-")
+
+    correction_level mengatur seberapa jauh pass koreksi dijalankan:
+    - "full" (default): semua pass merge/dedupe/koreksi — hasil paling akurat.
+    - "basic": lewati koreksi ulang blok numerik pasca merge/dedupe.
+    - "raw": kembalikan baris apa adanya setelah penempatan kolom — jauh lebih
+      cepat untuk pemakaian yang hanya butuh teks per kolom mentah.
     """
-    all_spans = extract_all_spans_with_bbox(input_path)
+    all_spans = extract_all_spans_with_bbox(source)
     if not all_spans:
         return []
     rows_raw = _group_spans_into_rows(all_spans)
@@ -1328,7 +1625,7 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
             header_row_idx = i
             break
     if header_row_idx is None:
-        blue_only = [s for s in all_spans if s.get("is_blue")]
+        blue_only = [s for s in all_spans if s.is_blue]
         return build_table_from_spans(blue_only)
 
     header_spans = rows_raw[header_row_idx][2]
@@ -1336,24 +1633,29 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     # Kolom mengikuti jumlah alami dari header PDF (tanpa paksa merge/split) agar alignment benar
     TARGET_COLS = len(TEMPLATE_HEADER_18)  # 18 untuk output tampilan
 
-    def _build_header_cells(gap: float) -> list[dict]:
-        """Gabungkan span header menjadi cell berdasarkan gap X (satu cell per kolom nyata)."""
-        spans_sorted = sorted(header_spans, key=lambda s: (s.get("bbox") or (0, 0, 0, 0))[0])
+    # Urutkan + normalisasi span header SEKALI; tiap kandidat gap hanya jalan
+    # ulang penggabungannya, bukan sort + filter teksnya.
+    _header_items: list[tuple[float, float, str]] = []
+    for s in sorted(header_spans, key=lambda s: s.bbox[0]):
+        _t = _WS_RE.sub(" ", s.text).strip()
+        if _t:
+            _header_items.append((float(s.bbox[0]), float(s.bbox[2]), _t))
+
+    def _build_header_cells(gap: float, max_cells: int = TARGET_COLS + 2) -> list[dict]:
+        """Gabungkan span header menjadi cell berdasarkan gap X (satu cell per kolom nyata).
+        Berhenti setelah max_cells: sel di atas 20 toh dibuang oleh [:TARGET_COLS]."""
         cells: list[dict] = []
         cur_x0 = None
         cur_x1 = None
         cur_texts: list[str] = []
-        for s in spans_sorted:
-            bbox = s.get("bbox") or (0, 0, 0, 0)
-            x0, x1 = float(bbox[0]), float(bbox[2])
-            t = " ".join((s.get("text") or "").split())
-            if not t:
-                continue
+        for x0, x1, t in _header_items:
             if cur_x1 is not None and x0 > (cur_x1 + gap):
                 cells.append({"x0": cur_x0, "x1": cur_x1, "text": " ".join(cur_texts).strip()})
                 cur_x0 = None
                 cur_x1 = None
                 cur_texts = []
+                if len(cells) >= max_cells:
+                    break
             if cur_x0 is None:
                 cur_x0 = x0
             cur_x1 = x1 if cur_x1 is None else max(cur_x1, x1)
@@ -1362,20 +1664,22 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
             cells.append({"x0": cur_x0, "x1": cur_x1, "text": " ".join(cur_texts).strip()})
         return [c for c in cells if (c.get("x1") is not None and c.get("x0") is not None and c.get("x1") > c.get("x0"))]
 
-    # Pilih gap yang menghasilkan jumlah kolom terbanyak (jangan merge kolom yang terpisah di PDF)
+    # Pilih gap yang menghasilkan jumlah kolom terbanyak (jangan merge kolom yang terpisah di PDF).
+    # Jumlah cell monoton tak-naik terhadap gap, jadi begitu hasil mengecil
+    # (atau tidak valid) kandidat berikutnya tak mungkin lebih baik — berhenti.
     gap_candidates = [0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0, 10.0, float(COLUMN_X_GAP)]
     best_cells = None
     for g in gap_candidates:
         c = _build_header_cells(g)
         if not c or len(c) < 8:
-            continue
+            break
         if best_cells is None or len(c) > len(best_cells):
             best_cells = c
-        if len(c) >= 20:
+        if len(c) >= 20 or len(c) < len(best_cells):
             break
 
     if not best_cells:
-        blue_only = [s for s in all_spans if s.get("is_blue")]
+        blue_only = [s for s in all_spans if s.is_blue]
         return build_table_from_spans(blue_only)
 
     header_cells = sorted(best_cells, key=lambda c: c["x0"])
@@ -1389,10 +1693,10 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     # - Jika header_cells >= 18, gunakan boundary 18 kolom dari header (paling presisi).
     # - Fallback: jika header_cells terlalu sedikit, bagi rata seluruh lebar tabel menjadi 18.
 
-    blue_spans_all = [s for s in all_spans if s.get("is_blue") and s.get("bbox")]
+    blue_spans_all = [s for s in all_spans if s.is_blue and s.bbox]
     if blue_spans_all:
-        data_x0_min = min(float((s.get("bbox") or (0, 0, 0, 0))[0]) for s in blue_spans_all)
-        data_x1_max = max(float((s.get("bbox") or (0, 0, 0, 0))[2]) for s in blue_spans_all)
+        data_x0_min = min(float(s.bbox[0]) for s in blue_spans_all)
+        data_x1_max = max(float(s.bbox[2]) for s in blue_spans_all)
     else:
         data_x0_min = float(header_cells[0]["x0"])
         data_x1_max = float(header_cells[-1]["x1"])
@@ -1400,36 +1704,34 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     left_limit = min(float(header_cells[0]["x0"]), data_x0_min) - 2.0
     right_limit = max(float(header_cells[-1]["x1"]), data_x1_max) + 2.0
 
-    edges: list[float] = []
+    # Edges dirakit sebagai array: titik tengah antar-cell dihitung vektor,
+    # bukan append per indeks. Nilainya identik dengan loop lama.
     if len(header_cells) >= TARGET_COLS:
         # Boundary full dari header (18 kolom)
         hc = header_cells[:TARGET_COLS]
-        edges.append(float(hc[0]["x0"]))
-        for i in range(TARGET_COLS - 1):
-            x1_current = float(hc[i]["x1"])
-            x0_next = float(hc[i + 1]["x0"])
-            edges.append((x1_current + x0_next) / 2)
-        edges.append(float(hc[-1]["x1"]))
+        hx0 = np.asarray([c["x0"] for c in hc], dtype=np.float64)
+        hx1 = np.asarray([c["x1"] for c in hc], dtype=np.float64)
+        edges = np.concatenate(([hx0[0]], (hx1[:-1] + hx0[1:]) / 2, [hx1[-1]])).tolist()
     elif len(header_cells) >= len(TEMPLATE_HEADER_FIXED):
         # Ambil 11 kolom fixed pertama dari header, lalu bagi kanan menjadi 7 kolom
         fixed_n = len(TEMPLATE_HEADER_FIXED)  # 11
         hc = header_cells[:fixed_n]
-        edges.append(float(hc[0]["x0"]))
-        for i in range(fixed_n - 1):
-            x1_current = float(hc[i]["x1"])
-            x0_next = float(hc[i + 1]["x0"])
-            edges.append((x1_current + x0_next) / 2)
-        status_right = float(hc[-1]["x1"])
-        edges.append(status_right)
+        hx0 = np.asarray([c["x0"] for c in hc], dtype=np.float64)
+        hx1 = np.asarray([c["x1"] for c in hc], dtype=np.float64)
+        status_right = float(hx1[-1])
         # 7 kolom numerik/perubahan di kanan
         segs = TARGET_COLS - fixed_n  # 7
         span = max(1.0, right_limit - status_right)
-        for i in range(1, segs + 1):
-            edges.append(status_right + (i * span / segs))
+        edges = np.concatenate((
+            [hx0[0]],
+            (hx1[:-1] + hx0[1:]) / 2,
+            [status_right],
+            status_right + np.arange(1, segs + 1) * span / segs,
+        )).tolist()
     else:
         # Fallback: bagi rata seluruh lebar menjadi 18 kolom
         span = max(1.0, right_limit - left_limit)
-        edges = [left_limit + (i * span / TARGET_COLS) for i in range(TARGET_COLS + 1)]
+        edges = (left_limit + np.arange(TARGET_COLS + 1) * span / TARGET_COLS).tolist()
 
     # Normalisasi edges agar strictly increasing dan pakai left/right limit
     edges[0] = left_limit
@@ -1449,138 +1751,128 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
         # Jika hanya "-", kembalikan kosong
         if s == "-":
             return ""
-        return " ".join(s.split())
-
-    def column_index_for_span(bbox) -> int:
-        """Tentukan kolom untuk span berdasarkan overlap area maksimum (posisi X di halaman)."""
-        x0, _, x1, _ = bbox
-        mid_x = (x0 + x1) / 2
-        best_col = None
-        max_overlap = 0.0
-        
-        for j, (cx0, cx1) in enumerate(column_boundaries):
-            overlap_start = max(x0, cx0)
-            overlap_end = min(x1, cx1)
-            if overlap_start < overlap_end:
-                overlap = overlap_end - overlap_start
-                if overlap > max_overlap:
-                    max_overlap = overlap
-                    best_col = j
-        
-        if best_col is not None:
-            return best_col
-        # Fallback: kolom yang mengandung mid_x
-        for j, (cx0, cx1) in enumerate(column_boundaries):
-            if cx0 <= mid_x <= cx1:
-                return j
-            if mid_x < cx0:
-                return max(0, j - 1)
-        return num_cols - 1
-
-    def _bbox_overlaps_col(bbox, col_idx: int) -> bool:
-        x0, x1 = bbox[0], bbox[2]
-        cx0, cx1 = column_boundaries[col_idx]
-        return not (x1 <= cx0 or x0 >= cx1)
+        return _WS_RE.sub(" ", s)
 
     # Header top dihapus - tidak perlu tampilkan "Kepemilikan Per tanggal"
     header_top = []
 
-    # PENDEKATAN SEDERHANA: Ambil semua spans biru dari baris data, kelompokkan per baris
-    # Kumpulkan semua spans biru dari baris data (setelah header)
-    all_blue_spans = []
+    # PENDEKATAN SEDERHANA: Ambil semua spans biru dari baris data, kelompokkan per baris.
+    # SoA: teks/halaman di list Python, koordinat di array NumPy paralel — indeks
+    # span jadi "pointer" ke semuanya, tanpa alokasi dict per span.
+    blue_texts = []
+    blue_pages = []
+    blue_bboxes = []
     for idx in range(header_row_idx + 1, len(rows_raw)):
         _y, _page, row_spans = rows_raw[idx]
         for s in row_spans:
-            if s.get("is_blue"):
-                bbox = s.get("bbox") or (0, 0, 0, 0)
-                text = (s.get("text") or "").strip()
+            if s.is_blue:
+                text = s.text
                 if text and text != "-":
-                    all_blue_spans.append({
-                        "bbox": bbox,
-                        "text": text,
-                        "page": _page,
-                        "y_mid": (bbox[1] + bbox[3]) / 2,
-                        "x_mid": (bbox[0] + bbox[2]) / 2,
-                        "y0": bbox[1],
-                        "y1": bbox[3],
-                    })
-    
-    if not all_blue_spans:
-        blue_only = [s for s in all_spans if s.get("is_blue")]
+                    blue_texts.append(text)
+                    blue_pages.append(_page)
+                    blue_bboxes.append(s.bbox)
+
+    if not blue_texts:
+        blue_only = [s for s in all_spans if s.is_blue]
         return build_table_from_spans(blue_only)
-    
+
+    n_spans = len(blue_texts)
+    sx0 = np.fromiter((b[0] for b in blue_bboxes), dtype=np.float64, count=n_spans)
+    sy0 = np.fromiter((b[1] for b in blue_bboxes), dtype=np.float64, count=n_spans)
+    sx1 = np.fromiter((b[2] for b in blue_bboxes), dtype=np.float64, count=n_spans)
+    sy1 = np.fromiter((b[3] for b in blue_bboxes), dtype=np.float64, count=n_spans)
+    y_mid_arr = (sy0 + sy1) * 0.5
+    x_mid_arr = (sx0 + sx1) * 0.5
+
+    # Tentukan kolom SEMUA span sekali via broadcasting: overlap X maksimum
+    # terhadap 18 kolom (seri/overlap nol jatuh ke kolom yang memuat mid_x,
+    # lewat searchsorted pada edges — sama dengan scan linear per span dulu).
+    cx0 = np.asarray([b[0] for b in column_boundaries], dtype=np.float64)
+    cx1 = np.asarray([b[1] for b in column_boundaries], dtype=np.float64)
+    overlap = np.minimum(sx1[:, None], cx1[None, :]) - np.maximum(sx0[:, None], cx0[None, :])
+    best_col = overlap.argmax(axis=1)  # seri -> kolom pertama, seperti loop lama
+    mid_fallback = np.clip(
+        np.searchsorted(np.asarray(edges, dtype=np.float64), x_mid_arr, side="left") - 1,
+        0, num_cols - 1,
+    )
+    col_assign = np.where(overlap[np.arange(n_spans), best_col] > 0, best_col, mid_fallback)
+
     # Hitung jarak baris normal untuk deteksi merge cell
-    y_positions = sorted(set(s["y_mid"] for s in all_blue_spans))
-    if len(y_positions) > 1:
-        row_gaps = [y_positions[i+1] - y_positions[i] for i in range(len(y_positions)-1)]
-        sorted_gaps = sorted(row_gaps)
-        median_gap = sorted_gaps[len(sorted_gaps) // 2] if sorted_gaps else 10
+    y_positions = np.unique(y_mid_arr)  # = sorted(set(...)), level C
+    gaps = np.diff(y_positions)
+    if gaps.size:
+        median_gap = float(np.median(gaps))
         avg_row_gap = median_gap if median_gap > 0 else 10
     else:
         avg_row_gap = 10
-    
-    # Clustering Y positions: group Y yang berdekatan
+
+    # Clustering Y positions: satu sweep atas daftar terurut — cluster baru
+    # dimulai saat jarak ke cluster terakhir > toleransi (y_positions sudah
+    # ascending, jadi cluster terdekat selalu yang terakhir ditambahkan).
     y_clusters = []
-    for y_pos in y_positions:
-        found = False
-        for cluster_y in y_clusters:
-            if abs(y_pos - cluster_y) <= ROW_Y_TOLERANCE:
-                found = True
-                break
-        if not found:
+    for y_pos in y_positions.tolist():
+        if not y_clusters or y_pos - y_clusters[-1] > ROW_Y_TOLERANCE:
             y_clusters.append(y_pos)
-    y_clusters.sort()
-    
-    # Deteksi merge cells: span dengan tinggi lebih besar dari normal atau overlap dengan multiple clusters
+    y_cluster_arr = np.asarray(y_clusters, dtype=np.float64)
+
+    # Deteksi merge cells: span dengan tinggi lebih besar dari normal atau
+    # overlap dengan multiple clusters — mask dihitung vektor untuk semua span
+    heights = sy1 - sy0
+    lo_arr = np.searchsorted(y_cluster_arr, sy0 - ROW_Y_TOLERANCE, side="left")
+    hi_arr = np.searchsorted(y_cluster_arr, sy1 + ROW_Y_TOLERANCE, side="right")
+    merged_mask = (hi_arr - lo_arr > 1) | (heights > avg_row_gap * 1.3) | (heights > 10)
     merged_cells_info = []
-    for span in all_blue_spans:
-        bbox = span["bbox"]
-        y0, y1 = bbox[1], bbox[3]
-        bbox_height = y1 - y0
-        
-        # Cari semua cluster Y yang overlap dengan bbox ini
-        overlapping_clusters = []
-        for cluster_y in y_clusters:
-            if (y0 - ROW_Y_TOLERANCE <= cluster_y <= y1 + ROW_Y_TOLERANCE):
-                overlapping_clusters.append(cluster_y)
-        
-        # Merge cell jika overlap dengan lebih dari 1 cluster Y atau tinggi > threshold
-        is_merged = (len(overlapping_clusters) > 1 or bbox_height > avg_row_gap * 1.3 or bbox_height > 10)
-        
-        if is_merged:
-            col_idx = column_index_for_span(bbox)
-            if 0 <= col_idx < num_cols:
-                merged_cells_info.append({
-                    "col": col_idx,
-                    "y0": y0,
-                    "y1": y1,
-                    "data": span["text"],
-                    "page": span["page"],
-                    "overlapping_clusters": overlapping_clusters
-                })
-    
-    # Kelompokkan spans per baris berdasarkan cluster Y
-    rows_by_cluster = {}  # {(page, cluster_y): [spans]}
-    for span in all_blue_spans:
-        page = span["page"]
-        y_mid = span["y_mid"]
-        
-        # Cari cluster terdekat
-        cluster_y = None
-        min_dist = float('inf')
-        for cy in y_clusters:
-            dist = abs(y_mid - cy)
-            if dist < min_dist:
-                min_dist = dist
-                cluster_y = cy
-        
-        if cluster_y is None:
-            cluster_y = y_mid
-        
-        key = (page, cluster_y)
+    for i in np.flatnonzero(merged_mask).tolist():
+        col_idx = int(col_assign[i])
+        if 0 <= col_idx < num_cols:
+            merged_cells_info.append({
+                "col": col_idx,
+                "y0": float(sy0[i]),
+                "y1": float(sy1[i]),
+                "data": blue_texts[i],
+                "page": blue_pages[i],
+                "overlapping_clusters": y_clusters[int(lo_arr[i]):int(hi_arr[i])]
+            })
+
+    # Kelompokkan indeks span per baris berdasarkan cluster Y terdekat.
+    # Penentuan cluster divektorkan: searchsorted lalu bandingkan dua tetangga;
+    # seri jarak memilih cluster lebih kecil (sama dengan scan linear lama).
+    pos = np.searchsorted(y_cluster_arr, y_mid_arr)
+    left = np.clip(pos - 1, 0, len(y_clusters) - 1)
+    right = np.clip(pos, 0, len(y_clusters) - 1)
+    take_left = np.abs(y_mid_arr - y_cluster_arr[left]) <= np.abs(y_cluster_arr[right] - y_mid_arr)
+    nearest = np.where(take_left, left, right)
+    rows_by_cluster = {}  # {(page, cluster_y): [indeks span]}
+    for i, ci in enumerate(nearest):
+        key = (blue_pages[i], y_clusters[ci])
         if key not in rows_by_cluster:
             rows_by_cluster[key] = []
-        rows_by_cluster[key].append(span)
+        rows_by_cluster[key].append(i)
+
+    # Supresi bbox: buang span kecil yang hampir seluruhnya tertutup span lain
+    # yang lebih besar di baris yang sama (artefak render ganda/bayangan) agar
+    # tidak salah kolom dan tidak memicu pass koreksi di hilir.
+    BBOX_SUPPRESS_RATIO = 0.8
+    span_areas = (sx1 - sx0) * (sy1 - sy0)
+    for key, idxs in rows_by_cluster.items():
+        if len(idxs) < 2:
+            continue
+        keep = []
+        for i in idxs:
+            suppressed = False
+            for j in idxs:
+                if j == i or span_areas[j] <= span_areas[i]:
+                    continue
+                ix = min(sx1[i], sx1[j]) - max(sx0[i], sx0[j])
+                iy = min(sy1[i], sy1[j]) - max(sy0[i], sy0[j])
+                if (ix > 0 and iy > 0 and span_areas[i] > 0
+                        and (ix * iy) / span_areas[i] > BBOX_SUPPRESS_RATIO):
+                    suppressed = True
+                    break
+            if not suppressed:
+                keep.append(i)
+        if len(keep) != len(idxs):
+            rows_by_cluster[key] = keep
     
     # BEST PRACTICE: Baca data teks biru kiri-ke-kanan, atas-ke-bawah.
     # Urutan baris = atas ke bawah (sorted_row_keys). Dalam tiap baris, urutan span = kiri ke kanan (sort by x_mid).
@@ -1594,19 +1886,16 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     for (page, cluster_y) in sorted_row_keys:
         spans_in_row = rows_by_cluster[(page, cluster_y)]
         # Urutkan span kiri ke kanan (by x_mid) agar urutan baca = urutan di PDF
-        spans_in_row = sorted(spans_in_row, key=lambda s: (s.get("x_mid") or 0))
+        spans_in_row = sorted(spans_in_row, key=x_mid_arr.__getitem__)
         
         cells = [""] * num_cols
         # Kumpulkan semua nilai yang mirip persen di baris (dari kolom manapun) beserta posisi X
         pending_percentages = []  # list of (x_mid, text)
         
-        for span in spans_in_row:
-            text = (span.get("text") or "").strip()
-            if not text:
-                continue
-            bbox = span.get("bbox") or (0, 0, 0, 0)
-            x_mid = (bbox[0] + bbox[2]) / 2
-            col_idx = column_index_for_span(bbox)
+        for span_i in spans_in_row:
+            text = blue_texts[span_i]  # sudah di-strip dan non-kosong saat dikumpulkan
+            x_mid = float(x_mid_arr[span_i])
+            col_idx = int(col_assign[span_i])
             if col_idx < 0:
                 col_idx = 0
             if col_idx >= num_cols:
@@ -1642,9 +1931,31 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     raw_data_rows = _merge_split_kode_emiten_rows(raw_data_rows, num_cols)
     # Hapus baris duplikat (No + Kode Efek sama)
     raw_data_rows = _remove_duplicate_data_rows(raw_data_rows, num_cols)
+
+    if correction_level == "raw":
+        # Jalur cepat: tanpa duplikasi merge-cell dan seluruh pass koreksi
+        raw_rows_18 = [
+            [str(c).strip() if c else "-" for c in (cells + [""] * TARGET_COLS)[:TARGET_COLS]]
+            for _ry, cells, _rp in raw_data_rows
+        ]
+        return {
+            "header_top": header_top,
+            "header_row": list(TEMPLATE_HEADER_18),
+            "data": raw_rows_18,
+            "raw_data": [list(TEMPLATE_HEADER_18)] + [list(r) for r in raw_rows_18],
+        }
     
-    # Duplicate merge cell data ke semua baris yang ter-merge
+    # Duplicate merge cell data ke semua baris yang ter-merge.
+    # Interval-join: baris per halaman sudah terurut Y, jadi kandidat tiap
+    # merge-cell diambil lewat rentang searchsorted — bukan scan semua baris.
     if merged_cells_info and raw_data_rows:
+        rows_idx_by_page = {}
+        for _ridx, _rdata in enumerate(raw_data_rows):
+            rows_idx_by_page.setdefault(_rdata[2], []).append(_ridx)
+        row_ys_by_page = {
+            _pg: np.asarray([raw_data_rows[_ridx][0] for _ridx in _idxs], dtype=np.float64)
+            for _pg, _idxs in rows_idx_by_page.items()
+        }
         for merge_info in merged_cells_info:
             col_idx = merge_info["col"]
             merge_y0 = merge_info["y0"]
@@ -1653,88 +1964,93 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
             merge_page = merge_info["page"]
             overlapping_clusters = merge_info.get("overlapping_clusters", [])
             
-            for row_idx, row_data in enumerate(raw_data_rows):
-                row_cluster_y, row_cells, row_page = row_data
-                
-                if row_page != merge_page:
+            page_idxs = rows_idx_by_page.get(merge_page)
+            if not page_idxs:
+                continue
+            row_ys = row_ys_by_page[merge_page]
+            if overlapping_clusters:
+                # Kandidat dibatasi rentang cluster; cocok persis dicek via set
+                cluster_set = set(overlapping_clusters)
+                lo = int(np.searchsorted(row_ys, overlapping_clusters[0], side="left"))
+                hi = int(np.searchsorted(row_ys, overlapping_clusters[-1], side="right"))
+            else:
+                cluster_set = None
+                tolerance = avg_row_gap * 0.4
+                lo = int(np.searchsorted(row_ys, merge_y0 - tolerance, side="left"))
+                hi = int(np.searchsorted(row_ys, merge_y1 + tolerance, side="right"))
+            for _k in range(lo, hi):
+                row_idx = page_idxs[_k]
+                row_cluster_y, row_cells, row_page = raw_data_rows[row_idx]
+                if cluster_set is not None and row_cluster_y not in cluster_set:
                     continue
                 
-                # Cek overlap
-                is_overlapping = False
-                if overlapping_clusters:
-                    is_overlapping = row_cluster_y in overlapping_clusters
-                else:
-                    tolerance = avg_row_gap * 0.4
-                    is_overlapping = (merge_y0 - tolerance <= row_cluster_y <= merge_y1 + tolerance)
-                
-                if is_overlapping:
-                    while len(row_cells) <= col_idx:
-                        row_cells.append("")
+                while len(row_cells) <= col_idx:
+                    row_cells.append("")
                     
-                    current_cell_data = row_cells[col_idx].strip() if row_cells[col_idx] else ""
+                current_cell_data = row_cells[col_idx].strip() if row_cells[col_idx] else ""
                     
-                    # Kolom Jumlah Saham / Persentase / Perubahan (11-17) bukan merge: baris ke-2, ke-3, ... dalam blok merge
-                    # jangan ditimpa agar nilai dari PDF (318 bawah, 247 bawah, dll.) tetap punya nilai sendiri.
-                    if 11 <= col_idx <= 17:
-                        is_second_or_later_in_block = False
-                        if overlapping_clusters:
-                            try:
-                                pos_in_block = overlapping_clusters.index(row_cluster_y)
-                                is_second_or_later_in_block = pos_in_block > 0
-                            except ValueError:
-                                pass
-                        if not is_second_or_later_in_block and row_idx > 0:
-                            prev_data = raw_data_rows[row_idx - 1]
-                            prev_y = prev_data[0] if len(prev_data) > 0 else None
-                            prev_page = prev_data[2] if len(prev_data) > 2 else row_page
-                            prev_cells = prev_data[1] if len(prev_data) > 1 else []
-                            if (prev_page == row_page and prev_y is not None and
-                                merge_y0 - 1 <= prev_y <= merge_y1 + 1 and
-                                merge_y0 - 1 <= row_cluster_y <= merge_y1 + 1 and
-                                prev_y < row_cluster_y):
+                # Kolom Jumlah Saham / Persentase / Perubahan (11-17) bukan merge: baris ke-2, ke-3, ... dalam blok merge
+                # jangan ditimpa agar nilai dari PDF (318 bawah, 247 bawah, dll.) tetap punya nilai sendiri.
+                if 11 <= col_idx <= 17:
+                    is_second_or_later_in_block = False
+                    if overlapping_clusters:
+                        try:
+                            pos_in_block = overlapping_clusters.index(row_cluster_y)
+                            is_second_or_later_in_block = pos_in_block > 0
+                        except ValueError:
+                            pass
+                    if not is_second_or_later_in_block and row_idx > 0:
+                        prev_data = raw_data_rows[row_idx - 1]
+                        prev_y = prev_data[0] if len(prev_data) > 0 else None
+                        prev_page = prev_data[2] if len(prev_data) > 2 else row_page
+                        prev_cells = prev_data[1] if len(prev_data) > 1 else []
+                        if (prev_page == row_page and prev_y is not None and
+                            merge_y0 - 1 <= prev_y <= merge_y1 + 1 and
+                            merge_y0 - 1 <= row_cluster_y <= merge_y1 + 1 and
+                            prev_y < row_cluster_y):
+                            is_second_or_later_in_block = True
+                        # Baris hasil split punya cluster_y sama; baris ke-2 jangan ditimpa (318 bawah: 2,000,000)
+                        if prev_page == row_page and prev_y is not None and prev_y == row_cluster_y:
+                            is_second_or_later_in_block = True
+                        # Dua baris dengan No sama (318/707 atas-bawah): baris ke-2 jangan ditimpa
+                        if prev_page == row_page and prev_cells and len(row_cells) > 0:
+                            no_prev = (prev_cells[0] or "").strip()
+                            no_cur = (row_cells[0] or "").strip()
+                            if no_prev and no_prev == no_cur:
                                 is_second_or_later_in_block = True
-                            # Baris hasil split punya cluster_y sama; baris ke-2 jangan ditimpa (318 bawah: 2,000,000)
-                            if prev_page == row_page and prev_y is not None and prev_y == row_cluster_y:
+                            # Baris lanjutan (No kosong) ikut baris sebelumnya: jangan timpa
+                            if no_prev and (not no_cur or no_cur == "-"):
                                 is_second_or_later_in_block = True
-                            # Dua baris dengan No sama (318/707 atas-bawah): baris ke-2 jangan ditimpa
-                            if prev_page == row_page and prev_cells and len(row_cells) > 0:
-                                no_prev = (prev_cells[0] or "").strip()
-                                no_cur = (row_cells[0] or "").strip()
-                                if no_prev and no_prev == no_cur:
-                                    is_second_or_later_in_block = True
-                                # Baris lanjutan (No kosong) ikut baris sebelumnya: jangan timpa
-                                if no_prev and (not no_cur or no_cur == "-"):
-                                    is_second_or_later_in_block = True
-                        if is_second_or_later_in_block:
-                            raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
-                            continue
+                    if is_second_or_later_in_block:
+                        raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
+                        continue
                     
-                    # Jangan timpa kolom numerik (11-17) jika sel sudah berisi angka yang wajar (mis. 2,000,000 di baris 318 bawah)
-                    if 11 <= col_idx <= 17 and current_cell_data:
-                        if (_looks_like_large_number(current_cell_data) or
-                                _looks_like_percentage_value(current_cell_data) or
-                                _looks_like_change_value(current_cell_data)):
-                            raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
-                            continue
+                # Jangan timpa kolom numerik (11-17) jika sel sudah berisi angka yang wajar (mis. 2,000,000 di baris 318 bawah)
+                if 11 <= col_idx <= 17 and current_cell_data:
+                    if (_looks_like_large_number(current_cell_data) or
+                            _looks_like_percentage_value(current_cell_data) or
+                            _looks_like_change_value(current_cell_data)):
+                        raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
+                        continue
                     
-                    # Jumlah Saham (1)/(2) (kolom 11, 14): jangan timpa baris bawah (No sama atau kosong) dengan nilai baris atas
-                    # agar 318 baris bawah tidak dapat 217,279,500/217,622,500 dari merge.
-                    if col_idx in (11, 14) and row_idx > 0:
-                        prev_cells = (raw_data_rows[row_idx - 1][1] if len(raw_data_rows[row_idx - 1]) > 1 else [])
-                        no_prev = (prev_cells[0] or "").strip() if prev_cells else ""
-                        no_cur = (row_cells[0] or "").strip() if row_cells else ""
-                        if no_prev and (no_cur == no_prev or not no_cur or no_cur == "-"):
-                            raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
-                            continue
+                # Jumlah Saham (1)/(2) (kolom 11, 14): jangan timpa baris bawah (No sama atau kosong) dengan nilai baris atas
+                # agar 318 baris bawah tidak dapat 217,279,500/217,622,500 dari merge.
+                if col_idx in (11, 14) and row_idx > 0:
+                    prev_cells = (raw_data_rows[row_idx - 1][1] if len(raw_data_rows[row_idx - 1]) > 1 else [])
+                    no_prev = (prev_cells[0] or "").strip() if prev_cells else ""
+                    no_cur = (row_cells[0] or "").strip() if row_cells else ""
+                    if no_prev and (no_cur == no_prev or not no_cur or no_cur == "-"):
+                        raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
+                        continue
                     
-                    # Jika kolom kosong atau merge_data lebih lengkap, gunakan merge_data
-                    if not current_cell_data:
+                # Jika kolom kosong atau merge_data lebih lengkap, gunakan merge_data
+                if not current_cell_data:
+                    row_cells[col_idx] = merge_data
+                elif merge_data != current_cell_data and merge_data not in current_cell_data:
+                    if len(merge_data) >= len(current_cell_data):
                         row_cells[col_idx] = merge_data
-                    elif merge_data != current_cell_data and merge_data not in current_cell_data:
-                        if len(merge_data) >= len(current_cell_data):
-                            row_cells[col_idx] = merge_data
                     
-                    raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
+                raw_data_rows[row_idx] = (row_cluster_y, row_cells, row_page)
     
     # Konversi ke data_rows - langsung gunakan cells yang sudah ditempatkan ke kolom yang benar
     data_rows = []
@@ -1742,61 +2058,47 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
         if len(row_data) >= 2:
             _, row, _ = row_data if len(row_data) == 3 else (None, row_data[1] if len(row_data) > 1 else [], None)
             if row:
-                # Pastikan row punya tepat num_cols kolom
-                padded_row = (list(row) + [""] * num_cols)[:num_cols]
-                data_rows.append(padded_row)
+                # Pastikan row punya tepat num_cols kolom (in-place: raw_data_rows
+                # tidak dipakai lagi setelah titik ini)
+                data_rows.append(_pad_inplace(row, num_cols, ""))
 
     # Finalisasi: pastikan selalu tepat 18 kolom, kosong = "-", dan koreksi Kode Efek/Nama Emiten
     template_header_row = list(TEMPLATE_HEADER_18)
-    final_data_rows = []
-    for row in data_rows:
-        # Pad atau trim ke tepat 18 kolom
-        padded_row = (list(row) + [""] * TARGET_COLS)[:TARGET_COLS]
-        normalized_row = []
-        for cell in padded_row:
-            cell_str = str(cell).strip() if cell else ""
-            if not cell_str or cell_str == "-":
-                normalized_row.append("-")
-            else:
-                normalized_row.append(cell_str)
-        # Jamin panjang tepat 18 (untuk baris yang mungkin kurang)
-        while len(normalized_row) < TARGET_COLS:
-            normalized_row.append("-")
-        normalized_row = normalized_row[:TARGET_COLS]
-        # Koreksi: kolom No jangan terisi kode efek (tukar/pecah/pindah)
-        _fix_no_kode_efek_cells(normalized_row, TARGET_COLS)
-        # Koreksi: jika Kode Efek berisi nama emiten dan Nama Emiten kosong, pindahkan
-        _fix_kode_emiten_cells(normalized_row, TARGET_COLS)
-        # Koreksi: data di kolom Perubahan (18) seharusnya di Persentase Kepemilikan % (17) hanya jika nilai mirip persen
-        _fix_persentase_perubahan_cells(normalized_row, TARGET_COLS)
-        # Koreksi: Persentase (1)/(2) dan Perubahan jangan berisi nama/alamat; tukar dengan nilai yang sesuai di blok 11-17
-        _fix_numeric_block_by_content(normalized_row, TARGET_COLS)
-        final_data_rows.append(normalized_row)
+    final_data_rows = [_normalize_and_fix_row(row, TARGET_COLS) for row in data_rows]
 
     # Gabungkan baris lanjutan (No "-") ke baris sebelumnya agar tidak jadi 2–3 baris terpisah
-    final_data_rows = _merge_continuation_rows(final_data_rows, TARGET_COLS)
+    changed_rows: list[bool] = []
+    final_data_rows = _merge_continuation_rows(final_data_rows, TARGET_COLS, changed_rows)
     # Rapikan Kode Efek: gabungkan baris duplikat No ketika baris pertama Kode Efek "-" dan baris kedua punya kode
-    final_data_rows = _dedupe_rows_fill_kode_efek(final_data_rows, TARGET_COLS)
+    final_data_rows = _dedupe_rows_fill_kode_efek(final_data_rows, TARGET_COLS, changed_rows)
     
-    # KOREKSI FINAL: Pastikan Persentase (1)/(2) dan Perubahan tidak berisi teks setelah merge/dedupe
-    # (karena merge/dedupe bisa mengubah data, perlu koreksi ulang)
-    for row in final_data_rows:
-        _fix_numeric_block_by_content(row, TARGET_COLS)
+    # KOREKSI FINAL: Pastikan Persentase (1)/(2) dan Perubahan tidak berisi teks setelah merge/dedupe.
+    # Hanya baris yang benar-benar diubah merge/dedupe yang dikoreksi ulang —
+    # baris lain sudah lewat koreksi di loop pertama dan tidak berubah sejak itu.
+    if correction_level == "full":
+        for row, row_changed in zip(final_data_rows, changed_rows):
+            if row_changed:
+                _fix_numeric_block_by_content(row, TARGET_COLS)
 
     # BEST PRACTICE: Jangan gabung Alamat — tetap 18 kolom sesuai raw data (No … Perubahan).
     # Data teks biru sudah ditempatkan per kolom (column_boundaries); tiap baris = 18 sel berurutan.
     header_18 = list(template_header_row)
     data_18 = []
     for row in final_data_rows:
-        row_18 = (list(row) + [""] * TARGET_COLS)[:TARGET_COLS]
-        while len(row_18) < TARGET_COLS:
-            row_18.append("-")
-        row_18 = [str(c).strip() if c else "-" for c in row_18[:TARGET_COLS]]
-        data_18.append(row_18)
+        row_18 = _pad_inplace(row, TARGET_COLS, "")
+        data_18.append([str(c).strip() if c else "-" for c in row_18])
     
     # Raw data untuk debugging: data mentah setelah ekstraksi (sebelum koreksi baris bawah dll.)
     raw_data_for_debug = [list(header_18)] + [list(row) for row in data_18]
     
+    # Klasifikasi bentuk sel dihitung batch: satu pass atas nilai sel UNIK
+    # mengisi lru_cache ketiga predikat terpanas, sehingga sapuan koreksi di
+    # bawah (yang memanggil predikat berkali-kali per baris) tinggal lookup.
+    for _uv in {c for r in data_18 for c in r}:
+        _looks_like_percentage_value(_uv)
+        _looks_like_large_number(_uv)
+        _looks_like_change_value(_uv)
+
     # Indeks 18 kolom (sesuai raw): 11=Jumlah(1), 12=Saham Gab(1), 13=Persentase(1), 14=Jumlah(2), 15=Saham Gab(2), 16=Persentase(2), 17=Perubahan
     TARGET_COLS_18 = TARGET_COLS  # 18
     idx_pct1_18 = 13
@@ -1817,12 +2119,10 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
         r[col_idx] = "-"
     
     for idx_row, row_18 in enumerate(data_18):
-        # Pastikan panjang 17 kolom
-        while len(row_18) < TARGET_COLS_18:
-            row_18.append("-")
-        row_18 = row_18[:TARGET_COLS_18]
-        data_18[idx_row] = row_18  # Pastikan perubahan tersimpan
-        
+        # Baris data_18 sudah dinormalisasi ke tepat 18 sel di atas — pad/potong
+        # di sini hanya jaga-jaga dan berjalan in-place tanpa salinan per baris
+        _pad_inplace(row_18, TARGET_COLS_18)
+
         # Jumlah Saham dan Saham Gabungan (10, 11, 13, 14) jangan berisi alamat/nama rekening
         for j_jar in (idx_jumlah1_18, idx_saham_gab1_18, idx_jumlah2_18, idx_saham_gab2_18):
             v_jar = get_18(j_jar, row_18)
@@ -2406,57 +2706,37 @@ def build_table_with_header_from_pdf(input_path: str) -> list[list[str]]:
     }
 
 
-def build_table_from_spans(span_items: list[dict]) -> list[list[str]]:
+def build_table_from_spans(span_items: list[SpanItem]) -> list[list[str]]:
     """Dari daftar span dengan bbox, bangun tabel: list of rows, tiap row = list of cell text."""
-    if not span_items:
+    spans = [s for s in span_items if s.text]
+    n = len(spans)
+    if not n:
         return []
-    # Urutkan: halaman -> y -> x
-    def key(s):
-        p = s.get("page", 1)
-        b = s.get("bbox") or (0, 0, 0, 0)
-        y = (b[1] + b[3]) / 2
-        x = b[0]
-        return (p, y, x)
-
-    sorted_spans = sorted(span_items, key=key)
-    rows = []
-    current_row_y = None
-    current_row_cells = []
-    current_cell_texts = []
-    last_x1 = None
-
-    for s in sorted_spans:
-        text = (s.get("text") or "").strip()
-        if not text:
-            continue
-        bbox = s.get("bbox") or (0, 0, 0, 0)
-        x0, y0, x1, y1 = bbox
-        mid_y = (y0 + y1) / 2
-
-        # Baris baru jika y beda cukup jauh
-        if current_row_y is not None and abs(mid_y - current_row_y) > ROW_Y_TOLERANCE:
-            if current_cell_texts:
-                current_row_cells.append(" ".join(current_cell_texts))
-            if current_row_cells:
-                rows.append(current_row_cells)
-            current_row_cells = []
-            current_cell_texts = []
-            last_x1 = None
-
-        current_row_y = mid_y
-
-        # Kolom baru jika jarak x cukup besar
-        if last_x1 is not None and (x0 - last_x1) > COLUMN_X_GAP:
-            if current_cell_texts:
-                current_row_cells.append(" ".join(current_cell_texts))
-            current_cell_texts = []
-        current_cell_texts.append(text)
-        last_x1 = x1
-
-    if current_cell_texts:
-        current_row_cells.append(" ".join(current_cell_texts))
-    if current_row_cells:
-        rows.append(current_row_cells)
+    # SoA + lexsort (halaman -> y -> x), lalu batas baris/sel dari diff antar
+    # tetangga — pola yang sama dengan _group_spans_into_rows.
+    pages = np.fromiter((s.page for s in spans), dtype=np.int64, count=n)
+    y_mid = np.fromiter(((s.bbox[1] + s.bbox[3]) / 2 for s in spans), dtype=np.float64, count=n)
+    x0s = np.fromiter((s.bbox[0] for s in spans), dtype=np.float64, count=n)
+    x1s = np.fromiter((s.bbox[2] for s in spans), dtype=np.float64, count=n)
+    order = np.lexsort((x0s, y_mid, pages))
+    ys = y_mid[order]
+    # Baris baru: y bergeser > toleransi dari span sebelumnya (loop lama juga
+    # membandingkan span-ke-span, bukan terhadap y awal baris)
+    row_break = np.empty(n, dtype=bool)
+    row_break[0] = True
+    row_break[1:] = np.abs(np.diff(ys)) > ROW_Y_TOLERANCE
+    # Sel baru: awal baris, atau celah x terhadap span sebelumnya > COLUMN_X_GAP
+    cell_break = row_break.copy()
+    cell_break[1:] |= (x0s[order][1:] - x1s[order][:-1]) > COLUMN_X_GAP
+
+    texts_sorted = [spans[i].text for i in order.tolist()]
+    bounds = np.flatnonzero(cell_break).tolist()
+    bounds.append(n)
+    rows: list[list[str]] = []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        if row_break[a]:
+            rows.append([])
+        rows[-1].append(" ".join(texts_sorted[a:b]))
     return rows
 
 
@@ -2472,10 +2752,15 @@ OUTPUT_STYLES = {
 TIGHT_LINE_MULT = 1.05  # sangat ketat, baris nyaris rapat
 
 
-def create_pdf_raw_blue_one_per_line(lines: list[str], output_path: str) -> None:
-    """Buat PDF berisi teks biru mentah: satu kata/baris, untuk debugging."""
+# Tabel kecil dilewatkan jalur cepat tanpa grid (lihat _build_table_doc)
+FAST_TABLE_ROW_LIMIT = 10
+FAST_TABLE_COL_LIMIT = 6
+
+
+def _build_raw_blue_doc(lines: list[str]):
+    """Susun dokumen fitz teks biru mentah (satu kata/baris). Return None jika kosong."""
     if not lines:
-        return
+        return None
     doc = fitz.open()
     blue_pdf = (0, 0, 1)
     margin = 50
@@ -2484,13 +2769,14 @@ def create_pdf_raw_blue_one_per_line(lines: list[str], output_path: str) -> None
     page_height = 842
     fontsize = 10
     line_step = fontsize * 1.4
+    font_ascent = fontsize * 0.9
     page = doc.new_page(width=page_width, height=page_height)
     for line in lines:
         line_safe = (line or "").strip()
         if not line_safe:
             continue
-        line_safe = "".join(c if ord(c) < 256 else "?" for c in line_safe)
-        pt = fitz.Point(margin, y + fontsize * 0.9)
+        line_safe = _to_latin1(line_safe)
+        pt = fitz.Point(margin, y + font_ascent)
         try:
             page.insert_text(pt, line_safe, fontsize=fontsize, color=blue_pdf, fontname="helv")
         except Exception:
@@ -2499,19 +2785,39 @@ def create_pdf_raw_blue_one_per_line(lines: list[str], output_path: str) -> None
         if y > page_height - margin - line_step:
             page = doc.new_page(width=page_width, height=page_height)
             y = margin
-    doc.save(output_path, garbage=1, deflate=False)
+    return doc
+
+
+def create_pdf_raw_blue_one_per_line(lines: list[str], output_path: str, compress: bool = True) -> None:
+    """Buat PDF berisi teks biru mentah: satu kata/baris, untuk debugging."""
+    doc = _build_raw_blue_doc(lines)
+    if doc is None:
+        return
+    doc.save(output_path, **_pdf_save_opts(compress))
     doc.close()
 
 
+def create_pdf_raw_blue_bytes(lines: list[str], compress: bool = True) -> bytes:
+    """Seperti create_pdf_raw_blue_one_per_line tapi kembalikan bytes PDF langsung."""
+    doc = _build_raw_blue_doc(lines)
+    if doc is None:
+        return b""
+    try:
+        return doc.tobytes(**_pdf_save_opts(compress))
+    finally:
+        doc.close()
+
+
 def create_pdf_with_blue_text(
-    blue_spans: list[dict], output_path: str, output_style: str = "paragraph"
+    blue_spans: list[dict], output_path: str, output_style: str = "paragraph", compress: bool = True
 ) -> None:
     """Buat PDF baru yang hanya berisi teks biru (tetap warna biru).
     output_style: 'paragraph' (standar), 'compact' (rapat), 'lines' (baris per baris untuk tabel).
     Jika semua teks dari satu halaman, spasi otomatis sangat ketat (single spacing).
     """
-    pages_used = {item.get("page", 1) for item in blue_spans}
-    single_page = len(pages_used) <= 1
+    # Short-circuit: berhenti di span pertama yang beda halaman, tanpa set
+    first_page = blue_spans[0].get("page", 1) if blue_spans else 1
+    single_page = all(item.get("page", 1) == first_page for item in blue_spans)
     # Compact atau satu halaman → spasi ketat seperti Shift+Enter (baris menempel)
     use_tight_spacing = single_page or (output_style == "compact")
 
@@ -2522,6 +2828,12 @@ def create_pdf_with_blue_text(
     if use_tight_spacing:
         line_gap = 0
         para_gap = 0
+    else:
+        # Tanpa spasi ketat langkah baris tidak bergantung pada size item —
+        # cukup dihitung sekali di sini, bukan di dalam loop.
+        line_step = line_height + line_gap
+        empty_line_step = line_height * 0.5
+        min_line = line_height
 
     doc = fitz.open()
     blue_pdf = (0, 0, 1)
@@ -2530,6 +2842,22 @@ def create_pdf_with_blue_text(
     page_width = 595
     page_height = 842
     page = doc.new_page(width=page_width, height=page_height)
+    # TextWriter mengumpulkan semua glyph satu halaman lalu menulisnya sekali —
+    # bukan satu fragmen content-stream per insert_text.
+    tw = fitz.TextWriter(page.rect)
+
+    def _next_page():
+        nonlocal page, tw, y
+        tw.write_text(page, color=blue_pdf)
+        page = doc.new_page(width=page_width, height=page_height)
+        tw = fitz.TextWriter(page.rect)
+        y = margin
+
+    # Ambang pindah halaman dihitung di muka: satu perbandingan per cek,
+    # bukan dua pengurangan + cabang di setiap baris.
+    if not use_tight_spacing:
+        y_break = page_height - margin - min_line
+
     prev_source_page = None  # halaman sumber item sebelumnya
     for item in blue_spans:
         text = item.get("text") or ""
@@ -2543,52 +2871,47 @@ def create_pdf_with_blue_text(
         if use_tight_spacing:
             line_step = size * TIGHT_LINE_MULT
             empty_line_step = size * TIGHT_LINE_MULT * 0.4
-        else:
-            line_step = line_height + line_gap
-            empty_line_step = line_height * 0.5
+            min_line = size * (TIGHT_LINE_MULT + 0.3)
+            y_break = page_height - margin - min_line
 
         item_page = item.get("page", 1)
         # Satu spasi antar halaman sumber: [hal 4] ... [hal 5] diberi jarak
         if prev_source_page is not None and item_page != prev_source_page:
             y += line_step
-            min_line = size * (TIGHT_LINE_MULT + 0.3) if use_tight_spacing else line_height
-            if y > page_height - margin - min_line:
-                page = doc.new_page(width=page_width, height=page_height)
-                y = margin
+            if y > y_break:
+                _next_page()
         prev_source_page = item_page
 
         label = f"[hal {item_page}] "
-        full = label + text
+        # Sanitasi Latin-1 sekali untuk seluruh span — satu lintasan codec C,
+        # bukan satu panggilan per baris
+        full = _to_latin1(label + text)
         for line in full.split("\n"):
-            line = line.strip()
-            if not line:
+            # isspace() jalan di C dan tidak mengalokasikan string seperti strip()
+            if not line or line.isspace():
                 y += empty_line_step
                 continue
-            # Pastikan hanya karakter yang aman untuk font helv (Latin)
-            line_safe = "".join(c if ord(c) < 256 else "?" for c in line)
+            line_safe = line.strip()
             pt = fitz.Point(margin, y + size * 0.9)
             try:
-                page.insert_text(pt, line_safe, fontsize=size, color=blue_pdf, fontname="helv")
+                tw.append(pt, line_safe, font=FONT_HELV, fontsize=size)
             except Exception:
                 page.insert_text(pt, line_safe, fontsize=size, color=blue_pdf)
             y += line_step
-            min_line = size * (TIGHT_LINE_MULT + 0.3) if use_tight_spacing else line_height
-            if y > page_height - margin - min_line:
-                page = doc.new_page(width=page_width, height=page_height)
-                y = margin
+            if y > y_break:
+                _next_page()
         y += para_gap
-        min_line = size * (TIGHT_LINE_MULT + 0.3) if use_tight_spacing else line_height
-        if y > page_height - margin - min_line:
-            page = doc.new_page(width=page_width, height=page_height)
-            y = margin
-    doc.save(output_path, garbage=1, deflate=False)
+        if y > y_break:
+            _next_page()
+    tw.write_text(page, color=blue_pdf)
+    doc.save(output_path, **_pdf_save_opts(compress))
     doc.close()
 
 
-def create_pdf_from_table(table: list[list[str]], output_path: str) -> None:
-    """Buat PDF dengan tabel: grid garis + teks biru di tiap sel."""
+def _build_table_doc(table: list[list[str]]):
+    """Susun dokumen fitz berisi tabel (grid garis + teks biru). Return None jika tabel kosong."""
     if not table:
-        return
+        return None
     blue_pdf = (0, 0, 1)
     margin = 40
     page_width = 595
@@ -2596,53 +2919,137 @@ def create_pdf_from_table(table: list[list[str]], output_path: str) -> None:
     fontsize = 9
     cell_pad = 4
     row_height = fontsize * 1.4 + cell_pad * 2
+    font_ascent = fontsize * 0.9  # baseline teks relatif terhadap atas sel
 
     num_cols = max(len(row) for row in table) if table else 0
     if num_cols == 0:
-        return
+        return None
     # Normalisasi: setiap baris punya num_cols sel
     rows = [list(row) + [""] * (num_cols - len(row)) for row in table]
     # Perkiraan lebar kolom: bagi rata area konten
     content_width = page_width - 2 * margin
     col_width = content_width / num_cols
+    # Batas kolom dihitung sekali — tanpa akumulator x += col_width per sel
+    col_edges = tuple(margin + i * col_width for i in range(num_cols + 1))
+
+    # Tabel kecil: jalur cepat — semua sel ditulis lewat satu TextWriter di
+    # posisi kolomnya, tanpa grid dan tanpa layout textbox per sel.
+    if len(rows) <= FAST_TABLE_ROW_LIMIT and num_cols <= FAST_TABLE_COL_LIMIT:
+        doc = fitz.open()
+        page = doc.new_page(width=page_width, height=page_height)
+        tw = fitz.TextWriter(page.rect)
+        y = margin
+        for row in rows:
+            if y + row_height > page_height - margin:
+                tw.write_text(page, color=blue_pdf)
+                page = doc.new_page(width=page_width, height=page_height)
+                tw = fitz.TextWriter(page.rect)
+                y = margin
+            text_y = y + cell_pad + font_ascent
+            for c_idx, cell_text in enumerate(row):
+                text_safe = _to_latin1(cell_text or "")
+                if not text_safe or text_safe.isspace():
+                    continue
+                tw.append(
+                    fitz.Point(col_edges[c_idx] + cell_pad, text_y),
+                    text_safe,
+                    font=FONT_HELV,
+                    fontsize=fontsize,
+                )
+            y += row_height
+        tw.write_text(page, color=blue_pdf)
+        return doc
+
+    grid_grey = (0.7, 0.7, 0.7)
 
     doc = fitz.open()
     page = doc.new_page(width=page_width, height=page_height)
+    # Satu Shape (garis) + satu TextWriter (teks) per halaman: semuanya
+    # dikumpulkan lalu ditulis sekali, bukan per sel.
+    shape = page.new_shape()
+    tw = fitz.TextWriter(page.rect)
     y = margin
+    # Rect yang dipakai ulang (diubah in-place) — tanpa alokasi per sel
+    cell_box = fitz.Rect(0, 0, 0, 0)
+    # Posisi y baris di halaman aktif; grid digambar sekali saat flush
+    page_row_ys: list[float] = []
+
+    def _flush_page():
+        # Grid = garis bersama antar sel: (baris+1) horizontal + (kolom+1)
+        # vertikal, bukan empat sisi rect per sel.
+        if page_row_ys:
+            y_top = page_row_ys[0]
+            y_bot = page_row_ys[-1] + row_height
+            for ry in page_row_ys:
+                shape.draw_line((margin, ry), (margin + content_width, ry))
+            shape.draw_line((margin, y_bot), (margin + content_width, y_bot))
+            for cx in col_edges:
+                shape.draw_line((cx, y_top), (cx, y_bot))
+        shape.finish(color=grid_grey, width=0.5)
+        shape.commit()
+        tw.write_text(page, color=blue_pdf)
+        page_row_ys.clear()
 
     for r_idx, row in enumerate(rows):
         if y + row_height > page_height - margin:
+            _flush_page()
             page = doc.new_page(width=page_width, height=page_height)
+            shape = page.new_shape()
+            tw = fitz.TextWriter(page.rect)
             y = margin
-        x = margin
+        page_row_ys.append(y)
         for c_idx, cell_text in enumerate(row):
-            text_safe = "".join(c if ord(c) < 256 else "?" for c in (cell_text or ""))
-            rect = fitz.Rect(x, y, x + col_width, y + row_height)
-            # Garis batas sel
-            page.draw_rect(rect, color=(0.7, 0.7, 0.7), width=0.5)
-            # Teks di dalam sel (clip agar tidak keluar)
+            x0 = col_edges[c_idx]
+            x1 = col_edges[c_idx + 1]
+            text_safe = _to_latin1(cell_text or "")
+            # Sel kosong cukup kena grid — tidak perlu layout textbox
+            if not text_safe or text_safe.isspace():
+                continue
+            # Teks di dalam sel (fill_textbox memotong yang tidak muat)
+            cell_box.x0 = x0 + cell_pad
+            cell_box.y0 = y + cell_pad
+            cell_box.x1 = x1 - cell_pad
+            cell_box.y1 = y + row_height - cell_pad
             try:
-                page.insert_textbox(
-                    fitz.Rect(x + cell_pad, y + cell_pad, x + col_width - cell_pad, y + row_height - cell_pad),
-                    text_safe,
-                    fontsize=fontsize,
-                    color=blue_pdf,
-                    fontname="helv",
-                    align=fitz.TEXT_ALIGN_LEFT,
-                )
+                tw.fill_textbox(cell_box, text_safe, font=FONT_HELV, fontsize=fontsize)
             except Exception:
-                page.insert_text(
-                    fitz.Point(x + cell_pad, y + cell_pad + fontsize * 0.9),
+                tw.append(
+                    fitz.Point(x0 + cell_pad, y + cell_pad + font_ascent),
                     text_safe[:100],
+                    font=FONT_HELV,
                     fontsize=fontsize,
-                    color=blue_pdf,
                 )
-            x += col_width
         y += row_height
-    doc.save(output_path, garbage=1, deflate=False)
+    _flush_page()
+    return doc
+
+
+def create_pdf_from_table(table: list[list[str]], output_path: str, compress: bool = True) -> None:
+    """Buat PDF dengan tabel: grid garis + teks biru di tiap sel."""
+    doc = _build_table_doc(table)
+    if doc is None:
+        return
+    doc.save(output_path, **_pdf_save_opts(compress))
     doc.close()
 
 
+@functools.lru_cache(maxsize=64)
+def _render_table_pdf_cached(rows_key: tuple) -> bytes:
+    """Cache hasil render PDF tabel per payload — klik download ulang jadi instan."""
+    return create_pdf_from_table_bytes([list(r) for r in rows_key])
+
+
+def create_pdf_from_table_bytes(table: list[list[str]], compress: bool = True) -> bytes:
+    """Seperti create_pdf_from_table tapi kembalikan bytes PDF langsung (tanpa file sementara)."""
+    doc = _build_table_doc(table)
+    if doc is None:
+        return b""
+    try:
+        return doc.tobytes(**_pdf_save_opts(compress))
+    finally:
+        doc.close()
+
+
 def _column_index_by_header(header_row: list, name_keywords: tuple) -> int:
     """Cari indeks kolom yang judulnya mengandung salah satu keyword (case-insensitive). Return -1 jika tidak ketemu."""
     for idx, h in enumerate(header_row):
@@ -2779,7 +3186,7 @@ def _apply_raw_blue_fix_same_no_baris_bawah(
                     w = (lines[i] or "").strip()
                     if not w or w == "-":
                         continue
-                    w_normalized = w.replace(",", "").replace(" ", "").replace(".", "", 1)
+                    w_normalized = w.translate(_STRIP_COMMA_SPACE).replace(".", "", 1)
                     if not w_normalized.isdigit():
                         continue
                     try:
@@ -2800,7 +3207,7 @@ def _apply_raw_blue_fix_same_no_baris_bawah(
             # Filter generik: buang nilai yang sama dengan No baris berikutnya (dari raw)
             def _norm_num(s):
                 try:
-                    return str(int((s or "").replace(",", "").replace(" ", "")))
+                    return str(int((s or "").translate(_STRIP_COMMA_SPACE)))
                 except (ValueError, TypeError):
                     return (s or "").strip()
             if next_no_str is not None:
@@ -2848,7 +3255,7 @@ def _apply_raw_blue_fix_same_no_baris_bawah(
                     sg2_first = (first_row[idx_saham_gab2] or "").strip() or "-" if idx_saham_gab2 < len(first_row) else "-"
 
                     def _norm(s):
-                        return (s or "").replace(",", "").replace(" ", "")
+                        return (s or "").translate(_STRIP_COMMA_SPACE)
 
                     j2_val_norm = _norm(j2_val)
                     j2_first_norm = _norm(j2_first)
@@ -2883,7 +3290,7 @@ def _apply_raw_blue_fix_same_no_baris_bawah(
                         j1_current and j2_val
                         and _looks_like_large_number(j1_current)
                         and _looks_like_large_number(j2_val)
-                        and (j1_current.replace(",", "").replace(" ", "") == j2_val.replace(",", "").replace(" ", ""))
+                        and (j1_current.translate(_STRIP_COMMA_SPACE) == j2_val.translate(_STRIP_COMMA_SPACE))
                     )
                     if j1_current != "-" and j1_eq_j2:
                         row2[idx_j1] = "-"
@@ -2947,9 +3354,17 @@ def _apply_raw_blue_fix_same_no_baris_bawah(
             }
 
 
+# Halaman depan statis — render Jinja cukup sekali, request berikutnya
+# langsung dapat string yang sama.
+_INDEX_HTML: str | None = None
+
+
 @app.route("/")
 def index():
-    return render_template("index.html")
+    global _INDEX_HTML
+    if _INDEX_HTML is None:
+        _INDEX_HTML = render_template("index.html")
+    return _INDEX_HTML
 
 
 @app.route("/api/extract-blue", methods=["POST"])
@@ -2962,13 +3377,11 @@ def extract_blue():
         return jsonify({"error": "File tidak dipilih"}), 400
     if not file.filename.lower().endswith(".pdf"):
         return jsonify({"error": "Hanya file PDF yang didukung"}), 400
-    tmp_in_path = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_in:
-            file.save(tmp_in.name)
-            tmp_in_path = tmp_in.name
+        # Parse langsung dari memori — tanpa tulis/buka ulang file temp di disk
+        pdf_bytes = file.read()
         # Bangun tabel: baris pertama = header dari PDF (teks apa saja), sisanya = teks biru per kolom
-        result = build_table_with_header_from_pdf(tmp_in_path)
+        result = build_table_with_header_from_pdf(pdf_bytes)
         if not result:
             return jsonify({
                 "error": "Tidak ada teks warna biru ditemukan di PDF ini.",
@@ -2977,9 +3390,9 @@ def extract_blue():
         # Raw teks biru: ambil semua span biru, satu kata satu baris (untuk debugging)
         raw_blue_lines = []
         try:
-            blue_spans = extract_blue_spans_with_bbox(tmp_in_path)
+            blue_spans = extract_blue_spans_with_bbox(pdf_bytes)
             for item in blue_spans:
-                text = (item.get("text") or "").strip()
+                text = item.text
                 for word in text.split():
                     if word:
                         raw_blue_lines.append(word)
@@ -2991,14 +3404,11 @@ def extract_blue():
             debug_318_ref = {}
             _apply_raw_blue_fix_same_no_baris_bawah(data_rows, raw_blue_lines, header_row, debug_ref=debug_318_ref)
             target_cols = len(header_row)
-            # Pastikan header dan setiap baris data punya kolom sesuai header
-            header_row = (list(header_row) + [""] * target_cols)[:target_cols]
-            table = [header_row]
+            # Pastikan header dan setiap baris data punya kolom sesuai header —
+            # satu salinan per baris, pad/potong in-place
+            table = [_pad_inplace(list(header_row), target_cols, "")]
             for row in data_rows:
-                r = (list(row) + ["-"] * target_cols)[:target_cols]
-                while len(r) < target_cols:
-                    r.append("-")
-                table.append(r[:target_cols])
+                table.append(_pad_inplace(list(row), target_cols))
             out = {
                 "table": table,
                 "header_top": result.get("header_top") or [],
@@ -3007,16 +3417,10 @@ def extract_blue():
             }
             if debug_318_ref.get("707") is not None:
                 out["debug_707"] = debug_318_ref["707"]
-            return jsonify(out)
-        return jsonify({"table": result})
+            return ojsonify(out)
+        return ojsonify({"table": result})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        if tmp_in_path and os.path.exists(tmp_in_path):
-            try:
-                os.unlink(tmp_in_path)
-            except Exception:
-                pass
 
 
 @app.route("/api/download-raw-blue-pdf", methods=["POST"])
@@ -3028,15 +3432,7 @@ def download_raw_blue_pdf():
         if not lines or not isinstance(lines, list):
             return jsonify({"error": "Data lines tidak valid"}), 400
         lines = [str(x).strip() for x in lines if str(x).strip()]
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_out:
-            tmp_path = tmp_out.name
-        create_pdf_raw_blue_one_per_line(lines, tmp_path)
-        with open(tmp_path, "rb") as f:
-            pdf_bytes = f.read()
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
+        pdf_bytes = create_pdf_raw_blue_bytes(lines)
         return send_file(
             BytesIO(pdf_bytes),
             mimetype="application/pdf",
@@ -3056,28 +3452,21 @@ def download_pdf():
         if not table or not isinstance(table, list):
             return jsonify({"error": "Data tabel tidak valid"}), 400
         rows = [r if isinstance(r, list) else [str(r)] for r in table]
-        out_path = tempfile.mktemp(suffix=".pdf")
-        try:
-            create_pdf_from_table(rows, out_path)
-            buf = BytesIO()
-            with open(out_path, "rb") as f:
-                buf.write(f.read())
-            buf.seek(0)
-            return send_file(
-                buf,
-                mimetype="application/pdf",
-                as_attachment=True,
-                download_name="teks_biru_tabel.pdf",
-            )
-        finally:
-            if os.path.exists(out_path):
-                try:
-                    os.unlink(out_path)
-                except Exception:
-                    pass
+        if len(rows) > 10000 or max(len(r) for r in rows) > 100:
+            return jsonify({"error": "Tabel terlalu besar"}), 400
+        pdf_bytes = _render_table_pdf_cached(tuple(tuple(r) for r in rows))
+        return send_file(
+            BytesIO(pdf_bytes),
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name="teks_biru_tabel.pdf",
+        )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # threaded=True agar request tidak antre di satu thread; ekstraksi dan
+    # pembuatan PDF berjalan di C (PyMuPDF melepas GIL) sehingga bisa tumpang
+    # tindih. Untuk produksi jalankan via gunicorn -w <jumlah CPU> app:app.
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)